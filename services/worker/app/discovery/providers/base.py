@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Annotated, Protocol
 
-from pydantic import BaseModel, EmailStr, Field
+import msgspec
 
+# Loose shape check for emails extracted from provider output (full EmailStr validation is only on /contacts)
+_EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
 
-class DiscoveredContact(BaseModel):
-    full_name: str = Field(min_length=2, max_length=200)
-    title: str | None = Field(default=None, max_length=200)
-    company: str = Field(min_length=2, max_length=200)
-    email: EmailStr | None = None
-    source: str | None = Field(default=None, max_length=100)
-    linkedin_url: str | None = Field(default=None, max_length=500)
-    relevance_notes: str | None = Field(default=None, max_length=1000)
+
+class DiscoveredContact(msgspec.Struct, kw_only=True):
+    """Contact returned by a provider. Constraints are enforced when built via msgspec.convert(...)."""
+
+    full_name: Annotated[str, msgspec.Meta(min_length=2, max_length=200)]
+    title: Annotated[str, msgspec.Meta(max_length=200)] | None = None
+    company: Annotated[str, msgspec.Meta(min_length=2, max_length=200)]
+    email: Annotated[str, msgspec.Meta(max_length=320, pattern=_EMAIL_PATTERN)] | None = None
+    source: Annotated[str, msgspec.Meta(max_length=100)] | None = None
+    linkedin_url: Annotated[str, msgspec.Meta(max_length=500)] | None = None
+    relevance_notes: Annotated[str, msgspec.Meta(max_length=1000)] | None = None
 
 
 class ContactDiscoveryProvider(Protocol):
@@ -3,8 +3,10 @@ from __future__ import annotations
 import json
 import os
 import re
+from functools import lru_cache
 from typing import Any
 
+import msgspec
 from fastapi import HTTPException
 from openai import OpenAI
 from tavily import TavilyClient
@@ -80,17 +82,23 @@ def _parse_contacts_from_completion(content: str, company: str) -> list[Discover
         if not isinstance(email, str) or "@" not in email:
             item["email"] = None
         try:
-            out.append(DiscoveredContact.model_validate(item))
-        except Exception:
-            # If validation fails (e.g. invalid EmailStr), retry without email
+            out.append(msgspec.convert(item, DiscoveredContact))
+        except msgspec.ValidationError:
+            # If validation fails (e.g. malformed email), retry without email
             item["email"] = None
             try:
-                out.append(DiscoveredContact.model_validate(item))
-            except Exception:
+                out.append(msgspec.convert(item, DiscoveredContact))
+            except msgspec.ValidationError:
                 continue
     return out
 
 
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key: str) -> OpenAI:
+    """Reuse one OpenAI client (and its keep-alive pool) per API key across discover calls."""
+    return OpenAI(api_key=api_key)
+
+
 class TavilyProvider(ContactDiscoveryProvider):
     """Discover contacts using Tavily web search + OpenAI to extract structured contacts."""
 
@@ -115,7 +123,7 @@ class TavilyProvider(ContactDiscoveryProvider):
             )
 
         client_tavily = TavilyClient(api_key=self.tavily_api_key)
-        client_openai = OpenAI(api_key=self.openai_api_key)
+        client_openai = _get_openai_client(self.openai_api_key)
 
         queries = _build_search_queries(company, role, location)
         all_results: list[dict[str, Any]] = []
@@ -1,40 +1,91 @@
 from __future__ import annotations
 
-import base64
+import logging
 import os
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime
 
+import msgspec
+import pybase64
 from dotenv import load_dotenv
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from starlette.responses import Response
 
 load_dotenv()
 from pydantic import BaseModel, EmailStr, Field
-from sqlalchemy import Column, DateTime, Integer, String, create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import Column, DateTime, Index, Integer, String, create_engine, event, make_url, or_, tuple_
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.discovery.providers.base import DiscoveredContact
 from app.discovery.service import get_provider
 from app.resume.doc_gen import cover_letter_text_to_docx_bytes
 from app.resume.extract import extract_text_from_pdf
-from app.resume.pdf_gen import cover_letter_text_to_pdf_bytes, html_to_pdf_bytes, text_to_pdf_bytes
-from app.resume.tailor import answer_question, generate_cover_letter, tailor_resume
+from app.resume.pdf_gen import (
+    cover_letter_text_to_pdf_bytes,
+    html_to_pdf_bytes,
+    structured_resume_to_pdf_bytes,
+    text_to_pdf_bytes,
+)
+from app.resume.structured import resume_to_text
+from app.resume.tailor import (
+    answer_question_async,
+    generate_cover_letter_async,
+    stream_tailor_resume,
+    tailor_resume_structured_async,
+)
+
+# uvicorn's logging config only covers its own loggers, so without a handler here the app's INFO records
+# (OpenAI token usage, input truncation) are dropped. Skipped when the root logger is already configured.
+_app_logger = logging.getLogger("app")
+if not _app_logger.handlers and not logging.getLogger().handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+    _app_logger.addHandler(_log_handler)
+    _app_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
 DATABASE_URL = os.getenv("CONTACTS_DATABASE_URL", "sqlite:///./contacts.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+_db_url = make_url(DATABASE_URL)
+# In-memory SQLite gets a SingletonThreadPool, which rejects QueuePool sizing arguments
+_in_memory_sqlite = _db_url.get_backend_name() == "sqlite" and (
+    _db_url.database in (None, "", ":memory:") or _db_url.query.get("mode") == "memory"
+)
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    **({} if _in_memory_sqlite else {"pool_size": 5, "max_overflow": 10}),
+)
+
+
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+        """WAL lets /contacts reads run alongside /discover writes instead of failing with 'database is locked'."""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
 class Contact(Base):
     __tablename__ = "contacts"
+    __table_args__ = (Index("ix_contacts_name_company", "full_name", "company"),)
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String(200), nullable=False)
     title = Column(String(200), nullable=True)
     company = Column(String(200), nullable=False)
-    email = Column(String(320), nullable=True)
+    email = Column(String(320), nullable=True, index=True)
     source = Column(String(100), nullable=True)
     linkedin_url = Column(String(500), nullable=True)
     relevance_notes = Column(String(1000), nullable=True)
@@ -65,6 +116,19 @@ class ContactOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+_CONTACT_OUT_COLUMNS = (
+    Contact.id,
+    Contact.full_name,
+    Contact.title,
+    Contact.company,
+    Contact.email,
+    Contact.source,
+    Contact.linkedin_url,
+    Contact.relevance_notes,
+    Contact.created_at,
+)
+
+
 class DiscoverRequest(BaseModel):
     company: str = Field(min_length=2, max_length=200)
     role: str | None = Field(default=None, max_length=200)
@@ -88,115 +152,133 @@ class DiscoverResponse(BaseModel):
 
 
 Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title="Contact Discovery Worker")
+# create_all skips tables that already exist, so add indexes introduced after a DB was first created
+for _index in Contact.__table__.indexes:
+    _index.create(bind=engine, checkfirst=True)
 
 
-@app.get("/health")
-def health() -> dict:
-    return {"status": "ok"}
+_json_encoder = msgspec.json.Encoder()
 
 
-@app.post("/contacts", response_model=ContactOut)
-def create_contact(payload: ContactCreate) -> ContactOut:
+def get_db() -> Iterator[Session]:
+    """One session per request, closed when the response is done."""
     with SessionLocal() as db:
-        contact = Contact(
-            full_name=payload.full_name,
-            title=payload.title,
-            company=payload.company,
-            email=str(payload.email) if payload.email else None,
-            source=payload.source,
-            linkedin_url=payload.linkedin_url,
-            relevance_notes=payload.relevance_notes,
-        )
-        db.add(contact)
-        db.commit()
-        db.refresh(contact)
-        return ContactOut.model_validate(contact)
+        yield db
 
 
-@app.get("/contacts", response_model=list[ContactOut])
-def list_contacts(company: str | None = None) -> list[ContactOut]:
-    with SessionLocal() as db:
-        query = db.query(Contact)
-        if company:
-            query = query.filter(Contact.company.ilike(f"%{company}%"))
-        return [ContactOut.model_validate(row) for row in query.order_by(Contact.created_at.desc()).all()]
+app = FastAPI(title="Contact Discovery Worker")
 
 
-def upsert_contact(db: sessionmaker, candidate: DiscoveredContact) -> Contact:
-    if candidate.email:
-        existing = db.query(Contact).filter(Contact.email == str(candidate.email)).first()
-    else:
-        existing = (
-            db.query(Contact)
-            .filter(Contact.full_name == candidate.full_name, Contact.company == candidate.company)
-            .first()
-        )
+@app.get("/health")
+def health() -> dict:
+    return {"status": "ok"}
 
-    if existing:
-        if candidate.title and not existing.title:
-            existing.title = candidate.title
-        if candidate.source and not existing.source:
-            existing.source = candidate.source
-        if candidate.email and not existing.email:
-            existing.email = str(candidate.email)
-        if candidate.linkedin_url and not existing.linkedin_url:
-            existing.linkedin_url = candidate.linkedin_url
-        if candidate.relevance_notes and not existing.relevance_notes:
-            existing.relevance_notes = candidate.relevance_notes
-        db.commit()
-        db.refresh(existing)
-        return existing
 
+@app.post("/contacts", response_model=ContactOut)
+def create_contact(payload: ContactCreate, db: Session = Depends(get_db)) -> ContactOut:
     contact = Contact(
-        full_name=candidate.full_name,
-        title=candidate.title,
-        company=candidate.company,
-        email=str(candidate.email) if candidate.email else None,
-        source=candidate.source,
-        linkedin_url=candidate.linkedin_url,
-        relevance_notes=candidate.relevance_notes,
+        full_name=payload.full_name,
+        title=payload.title,
+        company=payload.company,
+        email=str(payload.email) if payload.email else None,
+        source=payload.source,
+        linkedin_url=payload.linkedin_url,
+        relevance_notes=payload.relevance_notes,
     )
     db.add(contact)
     db.commit()
     db.refresh(contact)
-    return contact
+    return ContactOut.model_validate(contact)
 
 
-@app.post("/discover", response_model=DiscoverResponse)
-def discover_contacts(payload: DiscoverRequest) -> DiscoverResponse:
-    provider = get_provider()
-    candidates = provider.discover(payload.company, payload.role, payload.location)
+@app.get("/contacts", response_class=ORJSONResponse, responses={200: {"model": list[ContactOut]}})
+def list_contacts(company: str | None = None, db: Session = Depends(get_db)) -> ORJSONResponse:
+    # Fetch plain column tuples; rows come from our own table so skip ORM + Pydantic re-validation.
+    query = db.query(*_CONTACT_OUT_COLUMNS)
+    if company:
+        query = query.filter(Contact.company.ilike(f"%{company}%"))
+    rows = query.order_by(Contact.created_at.desc()).all()
+    return ORJSONResponse([row._asdict() for row in rows])
+
 
+def upsert_contacts(db: Session, candidates: list[DiscoveredContact]) -> list[Contact]:
+    """Insert new contacts and fill empty fields on existing ones with one lookup query and one commit.
+
+    A candidate matches an existing row by email when it has one, otherwise by (full_name, company).
+    """
     if not candidates:
-        return DiscoverResponse(requested_company=payload.company, contacts=[])
-
-    contacts = [
-        DiscoveredContactOut(
-            full_name=c.full_name,
-            title=c.title,
-            company=c.company,
-            email=str(c.email) if c.email else None,
-            source=c.source,
-            linkedin_url=c.linkedin_url,
-            relevance_notes=c.relevance_notes,
+        return []
+
+    emails = {c.email for c in candidates if c.email}
+    name_keys = {(c.full_name, c.company) for c in candidates if not c.email}
+    conditions = []
+    if emails:
+        conditions.append(Contact.email.in_(emails))
+    if name_keys:
+        conditions.append(tuple_(Contact.full_name, Contact.company).in_(name_keys))
+
+    by_email: dict[str, Contact] = {}
+    by_name: dict[tuple[str, str], Contact] = {}
+    for row in db.query(Contact).filter(or_(*conditions)).order_by(Contact.id):
+        if row.email:
+            by_email.setdefault(row.email, row)
+        by_name.setdefault((row.full_name, row.company), row)
+
+    contacts: list[Contact] = []
+    for candidate in candidates:
+        email = candidate.email or None
+        existing = by_email.get(email) if email else by_name.get((candidate.full_name, candidate.company))
+
+        if existing:
+            if candidate.title and not existing.title:
+                existing.title = candidate.title
+            if candidate.source and not existing.source:
+                existing.source = candidate.source
+            if email and not existing.email:
+                existing.email = email
+                by_email.setdefault(email, existing)
+            if candidate.linkedin_url and not existing.linkedin_url:
+                existing.linkedin_url = candidate.linkedin_url
+            if candidate.relevance_notes and not existing.relevance_notes:
+                existing.relevance_notes = candidate.relevance_notes
+            contacts.append(existing)
+            continue
+
+        contact = Contact(
+            full_name=candidate.full_name,
+            title=candidate.title,
+            company=candidate.company,
+            email=email,
+            source=candidate.source,
+            linkedin_url=candidate.linkedin_url,
+            relevance_notes=candidate.relevance_notes,
         )
-        for c in candidates
-    ]
-    return DiscoverResponse(requested_company=payload.company, contacts=contacts)
+        db.add(contact)
+        if email:
+            by_email[email] = contact
+        by_name.setdefault((contact.full_name, contact.company), contact)
+        contacts.append(contact)
+
+    # Single flush batches the INSERT/UPDATE statements; no per-row commit or refresh
+    db.commit()
+    return contacts
+
+
+@app.post("/discover", responses={200: {"model": DiscoverResponse}})
+def discover_contacts(payload: DiscoverRequest) -> Response:
+    provider = get_provider()
+    candidates = provider.discover(payload.company, payload.role, payload.location)
+    # DiscoveredContact structs match DiscoveredContactOut field-for-field; msgspec encodes them natively
+    body = _json_encoder.encode({"requested_company": payload.company, "contacts": candidates})
+    return Response(content=body, media_type="application/json")
 
 
 class TailorResumeResponse(BaseModel):
     tailored_resume: str
-    pdf_base64: str
+    pdf_base64: str | None = None
 
 
-@app.post("/resume/tailor", response_model=TailorResumeResponse)
-async def resume_tailor(
-    resume: UploadFile = File(..., description="Resume PDF file"),
-    job_description: str = Form(..., min_length=50, description="Job description to tailor for"),
-) -> TailorResumeResponse:
+async def _read_resume_pdf_text(resume: UploadFile) -> str:
     if not resume.filename or not resume.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Resume must be a PDF file")
     try:
@@ -206,16 +288,55 @@ async def resume_tailor(
     if len(raw) > 10 * 1024 * 1024:
         raise HTTPException(status_code=400, detail="Resume file must be under 10 MB")
     try:
-        resume_text = extract_text_from_pdf(raw)
+        return await run_in_threadpool(extract_text_from_pdf, raw)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@app.post("/resume/tailor", response_class=ORJSONResponse, responses={200: {"model": TailorResumeResponse}})
+async def resume_tailor(
+    resume: UploadFile = File(..., description="Resume PDF file"),
+    job_description: str = Form(..., min_length=50, description="Job description to tailor for"),
+    inline: bool = Query(
+        True,
+        description="Embed the rendered PDF as base64. Pass false and fetch raw bytes from /resume/to-pdf instead.",
+    ),
+) -> ORJSONResponse:
+    resume_text = await _read_resume_pdf_text(resume)
     try:
-        tailored = tailor_resume(resume_text, job_description)
+        tailored_resume = await tailor_resume_structured_async(resume_text, job_description)
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e)) from e
-    pdf_bytes = text_to_pdf_bytes(tailored)
-    pdf_base64 = base64.b64encode(pdf_bytes).decode("ascii")
-    return TailorResumeResponse(tailored_resume=tailored, pdf_base64=pdf_base64)
+    # The editor and /resume/to-pdf work on text; the inline PDF renders from the fields without re-parsing it
+    tailored = resume_to_text(tailored_resume)
+    if not inline:
+        return ORJSONResponse({"tailored_resume": tailored})
+    pdf_bytes = await run_in_threadpool(structured_resume_to_pdf_bytes, tailored_resume)
+    # SIMD encoder straight to str: one allocation instead of b64 bytes + decoded copy
+    pdf_base64 = pybase64.b64encode_as_string(pdf_bytes)
+    return ORJSONResponse({"tailored_resume": tailored, "pdf_base64": pdf_base64})
+
+
+@app.post("/resume/tailor/stream", response_class=StreamingResponse)
+async def resume_tailor_stream(
+    resume: UploadFile = File(..., description="Resume PDF file"),
+    job_description: str = Form(..., min_length=50, description="Job description to tailor for"),
+) -> StreamingResponse:
+    """Stream the tailored resume as plain text while it is generated; render it with /resume/to-pdf once done."""
+    resume_text = await _read_resume_pdf_text(resume)
+    chunks = stream_tailor_resume(resume_text, job_description)
+    # Pull the first chunk here so configuration and API errors still map to a status code
+    try:
+        first = await anext(chunks)
+    except (ValueError, StopAsyncIteration) as e:
+        raise HTTPException(status_code=503, detail=str(e) or "OpenAI returned no text for the tailored resume") from e
+
+    async def body() -> AsyncIterator[str]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(body(), media_type="text/plain; charset=utf-8")
 
 
 class AnswerQuestionRequest(BaseModel):
@@ -232,7 +353,7 @@ class AnswerQuestionResponse(BaseModel):
 async def resume_answer_question(payload: AnswerQuestionRequest) -> AnswerQuestionResponse:
     """Generate a short answer for a job application form question using JD and resume context."""
     try:
-        answer = answer_question(
+        answer = await answer_question_async(
             payload.question,
             payload.resume_text,
             payload.job_description,
@@ -255,7 +376,7 @@ class CoverLetterResponse(BaseModel):
 async def resume_cover_letter(payload: CoverLetterRequest) -> CoverLetterResponse:
     """Generate a cover letter from resume text and job description."""
     try:
-        cover_letter = generate_cover_letter(
+        cover_letter = await generate_cover_letter_async(
             payload.resume_text,
             payload.job_description,
         )
@@ -270,7 +391,7 @@ class CoverLetterExportRequest(BaseModel):
 
 
 @app.post("/resume/cover-letter/export")
-async def cover_letter_export(payload: CoverLetterExportRequest) -> Response:
+def cover_letter_export(payload: CoverLetterExportRequest) -> Response:
     """Export cover letter as PDF or DOCX. Returns binary file."""
     if payload.format == "pdf":
         try:
@@ -301,7 +422,7 @@ class ResumeToPdfRequest(BaseModel):
 
 
 @app.post("/resume/to-pdf")
-async def resume_to_pdf(payload: ResumeToPdfRequest) -> Response:
+def resume_to_pdf(payload: ResumeToPdfRequest) -> Response:
     """Generate a PDF from resume text or HTML (for editing + download)."""
     if payload.resume_html:
         try:
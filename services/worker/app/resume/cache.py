@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import math
+import operator
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Embedding model for the optional semantic lookup (~1/100th the cost of a tailoring completion)
+EMBEDDING_MODEL = "text-embedding-3-small"
+# Keeps the embedding input safely under the model's 8191-token limit
+_EMBEDDING_MAX_CHARS = 20_000
+
+
+def _env_float(name: str) -> float | None:
+    raw = os.getenv(name)
+    return float(raw) if raw else None
+
+
+def _normalize(vec: list[float]) -> tuple[float, ...]:
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return tuple(x / norm for x in vec)
+
+
+class RedisTailorStore:
+    """Tailored resumes in Redis, shared by every worker and kept across restarts, so a redelivered job is free."""
+
+    prefix = "tailor:"
+
+    def __init__(self, url: str, ttl_seconds: float) -> None:
+        import redis
+
+        # Short timeouts: an unreachable Redis should cost a cache miss, not stall the request
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._error = redis.RedisError
+        self.ttl_seconds = int(ttl_seconds)
+
+    def get_many(self, keys: list[str]) -> list[dict[str, Any] | None]:
+        try:
+            raw = self._client.mget([self.prefix + key for key in keys])
+        except self._error as e:
+            logger.warning("Redis tailor cache read failed: %s", e)
+            return [None] * len(keys)
+        values: list[dict[str, Any] | None] = []
+        for value in raw:
+            try:
+                values.append(orjson.loads(value) if value is not None else None)
+            except orjson.JSONDecodeError:
+                values.append(None)
+        return values
+
+    def put_many(self, items: list[tuple[str, dict[str, Any]]]) -> None:
+        try:
+            # One round trip for the lot; no MULTI since each SETEX stands alone
+            with self._client.pipeline(transaction=False) as pipe:
+                for key, value in items:
+                    pipe.setex(self.prefix + key, self.ttl_seconds, orjson.dumps(value))
+                pipe.execute()
+        except self._error as e:
+            logger.warning("Redis tailor cache write failed: %s", e)
+
+
+def _redis_store(url: str | None, ttl_seconds: float) -> RedisTailorStore | None:
+    if not url:
+        return None
+    try:
+        return RedisTailorStore(url, ttl_seconds)
+    except ModuleNotFoundError:
+        logger.warning("REDIS_URL is set but the 'redis' package is not installed; caching in-process only")
+        return None
+
+
+class TailorCache:
+    """In-process LRU of tailored resumes keyed by content hash, with optional Redis and embedding layers.
+
+    With a Redis store, exact-key misses fall through to Redis and writes go to both, so results outlive the
+    process. The semantic lookup is off unless a cosine threshold is set: it only compares entries in the same
+    scope (one candidate's resume) and returns the stored result for a near-duplicate JD without calling the
+    model, so it should only be enabled with a strict threshold (e.g. 0.97).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 30 * 24 * 3600,
+        threshold: float | None = None,
+        remote: RedisTailorStore | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.remote = remote
+        # key -> (expires, value, semantic scope, normalized embedding)
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any], str | None, tuple[float, ...] | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def semantic(self) -> bool:
+        return self.threshold is not None
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """sha256 over the parts (e.g. model, prompt version, resume, JD), NUL-separated so they cannot run together."""
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    @staticmethod
+    def embedding_input(job_description: str) -> str:
+        # Only the JD is embedded: matches are confined to one resume's scope, so the JD is what varies
+        return job_description[:_EMBEDDING_MAX_CHARS]
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: list[str]) -> list[dict[str, Any] | None]:
+        """Values for keys, checking memory first and fetching the rest from Redis in one MGET."""
+        values = [self._get_local(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if self.remote is not None and missing:
+            for i, value in zip(missing, self.remote.get_many([keys[i] for i in missing])):
+                if value is not None:
+                    values[i] = value
+                    self._put_local(keys[i], value)
+        return values
+
+    async def aget(self, key: str) -> dict[str, Any] | None:
+        return (await self.aget_many([key]))[0]
+
+    async def aget_many(self, keys: list[str]) -> list[dict[str, Any] | None]:
+        """get_many for the event loop: memory hits return directly, Redis is queried off the loop."""
+        if self.remote is None:
+            return [self._get_local(key) for key in keys]
+        return await asyncio.to_thread(self.get_many, keys)
+
+    def _get_local(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def get_similar(self, scope: str, embedding: list[float]) -> dict[str, Any] | None:
+        """Best stored result in scope whose embedding has cosine similarity >= threshold, if any."""
+        if self.threshold is None:
+            return None
+        query = _normalize(embedding)
+        now = time.monotonic()
+        best_key, best_score = None, self.threshold
+        with self._lock:
+            for key, (expires, _, entry_scope, vec) in self._entries.items():
+                if vec is None or entry_scope != scope or expires < now:
+                    continue
+                score = sum(map(operator.mul, query, vec))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][1]
+
+    def put(
+        self,
+        key: str,
+        value: dict[str, Any],
+        embedding: list[float] | None = None,
+        scope: str | None = None,
+    ) -> None:
+        """Store a result; pass embedding and scope together to make it findable by get_similar."""
+        self._put_local(key, value, embedding, scope)
+        if self.remote is not None:
+            self.remote.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[tuple[str, dict[str, Any]]]) -> None:
+        """Store several results, writing them to Redis in one pipeline."""
+        items = list(items)
+        for key, value in items:
+            self._put_local(key, value)
+        if self.remote is not None and items:
+            self.remote.put_many(items)
+
+    async def aput(
+        self,
+        key: str,
+        value: dict[str, Any],
+        embedding: list[float] | None = None,
+        scope: str | None = None,
+    ) -> None:
+        self._put_local(key, value, embedding, scope)
+        if self.remote is not None:
+            await asyncio.to_thread(self.remote.put_many, [(key, value)])
+
+    async def aput_many(self, items: Iterable[tuple[str, dict[str, Any]]]) -> None:
+        items = list(items)
+        for key, value in items:
+            self._put_local(key, value)
+        if self.remote is not None and items:
+            await asyncio.to_thread(self.remote.put_many, items)
+
+    def _put_local(
+        self,
+        key: str,
+        value: dict[str, Any],
+        embedding: list[float] | None = None,
+        scope: str | None = None,
+    ) -> None:
+        vec = _normalize(embedding) if embedding is not None and scope is not None else None
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, scope, vec)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop the in-process entries; Redis entries expire on their own TTL."""
+        with self._lock:
+            self._entries.clear()
+
+
+_TTL_SECONDS = 30 * 24 * 3600
+
+tailor_cache = TailorCache(
+    max_entries=int(os.getenv("TAILOR_CACHE_MAX_ENTRIES", "256")),
+    ttl_seconds=_TTL_SECONDS,
+    threshold=_env_float("TAILOR_SEMANTIC_CACHE_THRESHOLD"),
+    remote=_redis_store(os.getenv("REDIS_URL"), _TTL_SECONDS),
+)
@@ -2,17 +2,21 @@ from __future__ import annotations
 
 import io
 
-import pdfplumber
+from pypdf import PdfReader
+from pypdf.errors import PyPdfError
 
 
 def extract_text_from_pdf(file_bytes: bytes) -> str:
     """Extract plain text from a PDF file. Raises ValueError if PDF is invalid or empty."""
-    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+    try:
+        reader = PdfReader(io.BytesIO(file_bytes))
         parts = []
-        for page in pdf.pages:
+        for page in reader.pages:
             text = page.extract_text()
             if text:
                 parts.append(text.strip())
-        if not parts:
-            raise ValueError("No text could be extracted from the PDF. It may be scanned or empty.")
-        return "\n\n".join(parts)
+    except PyPdfError as e:
+        raise ValueError(f"Could not read the PDF: {e}") from e
+    if not parts:
+        raise ValueError("No text could be extracted from the PDF. It may be scanned or empty.")
+    return "\n\n".join(parts)
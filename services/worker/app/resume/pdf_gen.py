@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import io
 import re
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
 from reportlab.lib import colors
@@ -14,18 +17,32 @@ from reportlab.platypus import (
     SimpleDocTemplate,
     Spacer,
 )
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
+from app.resume.structured import ordered_sections
 
-def _escape_amp_for_reportlab(s: str) -> str:
-    """Escape & for ReportLab XML only when not already an entity (avoid double-escaping &amp;)."""
-    return re.sub(r"&(?!amp;|lt;|gt;|quot;|#\d+;|#x[0-9a-f]+;)", "&amp;", s, flags=re.IGNORECASE)
+# Precompiled patterns used on every PDF render
+# Unescaped & (not already an entity); matched case-insensitively so &#X2F; counts as an entity
+_AMP_PATTERN = r"&(?!amp;|lt;|gt;|quot;|#\d+;|#x[0-9a-f]+;)"
+# One scan for **bold** + & escaping (plain text) and additionally strong/em/br (editor HTML)
+_BOLD_XML_RE = re.compile(rf"\*\*(.+?)\*\*|{_AMP_PATTERN}", re.DOTALL | re.IGNORECASE)
+_HTML_INLINE_RE = re.compile(rf"\*\*(.+?)\*\*|</?strong>|</?em>|<br>|{_AMP_PATTERN}", re.DOTALL | re.IGNORECASE)
+_SECTION_BOLD_RE = re.compile(r"^\*\*.+\*\*$")
+_ALIGN_STYLE_RE = re.compile(r"text-align\s*:\s*(left|center|right|justify)", re.IGNORECASE)
+# The HTML parser serializes line breaks as void <br>; ReportLab needs <br/>
+_HTML_INLINE_TAGS = {"<strong>": "<b>", "</strong>": "</b>", "<em>": "<i>", "</em>": "</i>", "<br>": "<br/>"}
+
+
+def _bold_xml_token(m: re.Match[str]) -> str:
+    bold = m.group(1)
+    if bold is not None:
+        return f"<b>{_BOLD_XML_RE.sub(_bold_xml_token, bold)}</b>"
+    return "&amp;"
 
 
 def _bold_to_xml(text: str) -> str:
-    """Convert **bold** to ReportLab <b> tags; escape & for XML."""
-    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text, flags=re.DOTALL)
-    text = _escape_amp_for_reportlab(text)
-    return text
+    """Convert **bold** to ReportLab <b> tags; escape & for XML (single pass)."""
+    return _BOLD_XML_RE.sub(_bold_xml_token, text)
 
 
 # Bullet markers we normalize to a single list style (hyphen in PDF)
@@ -35,48 +52,66 @@ _LIST_MARKER = "-   "  # hyphen + spaces for each point
 _UNICODE_DASHES = "\u002d\u2010\u2011\u2012\u2013\u2014\u2015\u2212\ufeff"
 # Unicode bullet variants (• U+2022, ‣ U+2023, ∙ U+2219, etc.) – normalize to hyphen for detection
 _UNICODE_BULLETS = "\u2022\u2023\u2219\u2043\u00b7"
+# Single-pass translate table: every dash/bullet variant -> "-", non-breaking space -> " "
+_NORMALIZE_TABLE = str.maketrans({c: "-" for c in _UNICODE_DASHES + _UNICODE_BULLETS} | {"\xa0": " "})
+_BULLET_PREFIX_SET = frozenset(_BULLET_PREFIXES)
 
 
 def _normalize_bullet_line(line: str) -> str:
     """Strip and normalize dash-like and bullet-like characters so we reliably detect and strip them."""
-    s = line.strip().replace("\xa0", " ")
-    for u in _UNICODE_DASHES:
-        s = s.replace(u, "-")
-    for u in _UNICODE_BULLETS:
-        s = s.replace(u, "-")
-    return s.strip()
+    return line.strip().translate(_NORMALIZE_TABLE).strip()
+
+
+def _is_normalized_bullet(s: str) -> bool:
+    """Like _is_bullet_line, for a line already passed through _normalize_bullet_line."""
+    # A leading "**" opens bold markup (e.g. "**Engineer | Acme**"), not an asterisk bullet
+    return bool(s) and s[0] in _BULLET_PREFIX_SET and not s.startswith("**")
+
+
+def _strip_normalized_bullet(s: str) -> str:
+    """Like _strip_bullet_prefix, for a line already passed through _normalize_bullet_line."""
+    if not _is_normalized_bullet(s):
+        return s
+    return s[1:].lstrip()
 
 
 def _is_bullet_line(line: str) -> bool:
     """True if line looks like a bullet point (starts with - • – — * after normalize)."""
-    s = _normalize_bullet_line(line)
-    return len(s) > 0 and s[0] in _BULLET_PREFIXES
+    return _is_normalized_bullet(_normalize_bullet_line(line))
 
 
 def _strip_bullet_prefix(line: str) -> str:
     """Remove leading bullet marker and spaces; return content only (no leading dash/bullet)."""
-    s = _normalize_bullet_line(line)
-    if not s or s[0] not in _BULLET_PREFIXES:
-        return s if s else ""
-    return s[1:].lstrip()
+    return _strip_normalized_bullet(_normalize_bullet_line(line))
 
 
 def _is_section_header(line: str) -> bool:
     line = line.strip()
     if not line:
         return False
+    # A dash/bullet-led line is a list item even when it is all caps (e.g. "- OSCP")
+    if line.translate(_NORMALIZE_TABLE).startswith("-"):
+        return False
+    # Headings never carry field separators; "**MS CS** | MIT" is an entry title even though it is all caps
+    if "|" in line:
+        return False
     # Single line, all caps (e.g. SUMMARY, EXPERIENCE) or **Section Name**
-    if re.match(r"^\*\*.+\*\*$", line):
+    if _SECTION_BOLD_RE.match(line):
         return True
     if len(line) < 50 and line.isupper() and len(line) > 2:
         return True
     return False
 
 
-def _looks_like_job_or_project_title(line: str) -> bool:
-    """True if line is likely a job/project title (bolded or has Company | Date), not a bullet."""
+def _looks_like_job_or_project_title(line: str, is_bullet: bool | None = None) -> bool:
+    """True if line is likely a job/project title (bolded or has Company | Date), not a bullet.
+
+    Pass is_bullet when the caller has already normalized the line, to skip normalizing it again.
+    """
     s = line.strip()
-    if not s or _is_bullet_line(line):
+    if is_bullet is None:
+        is_bullet = _is_bullet_line(line)
+    if not s or is_bullet:
         return False
     if s.startswith("**") or "**" in s:
         return True
@@ -148,8 +183,38 @@ def _build_styles(base: Any) -> dict[str, ParagraphStyle]:
     }
 
 
-def _parse_blocks(text: str) -> list[tuple[str, str]]:
-    """Parse resume text into (block_type, content) pairs. Types: title, contact, section, body, bullets."""
+@lru_cache(maxsize=1)
+def _get_styles() -> Mapping[str, ParagraphStyle]:
+    """Shared styles, built once per process. ParagraphStyle is reusable as long as callers never mutate it."""
+    return MappingProxyType(_build_styles(getSampleStyleSheet()))
+
+
+_ALIGNMENT_VALUES = {"left": 0, "center": 1, "right": 2, "justify": 4}
+
+
+@lru_cache(maxsize=32)
+def _style_with_alignment(style_key: str, align: str | None) -> ParagraphStyle:
+    """Return the shared style for style_key, or a cached derived copy with the given text alignment."""
+    base_style = _get_styles()[style_key]
+    if not align:
+        return base_style
+    align_lower = align.lower()
+    alignment_value = _ALIGNMENT_VALUES.get(align_lower, base_style.alignment)
+    # Create a lightweight derived style so we don't mutate shared styles
+    return ParagraphStyle(
+        f"{base_style.name}-{align_lower}",
+        parent=base_style,
+        alignment=alignment_value,
+    )
+
+
+@lru_cache(maxsize=128)
+def _parse_blocks(text: str) -> tuple[tuple[str, str], ...]:
+    """Parse resume text into (block_type, content) pairs. Types: title, contact, section, body, bullets.
+
+    Memoized: /resume/to-pdf is re-hit with the same text while the user previews, so the result is an
+    immutable tuple that is safe to share between requests.
+    """
     blocks: list[tuple[str, str]] = []
     # Split by double newline first
     raw_blocks = [b.strip() for b in text.split("\n\n") if b.strip()]
@@ -183,7 +248,9 @@ def _parse_blocks(text: str) -> list[tuple[str, str]]:
                     blocks.append(("body", rest))
             continue
         # Bullet block: first line with bullet char starts the list; split on new job/project titles so each gets its own heading + bullets
-        bullet_start = next((i for i, ln in enumerate(lines) if _is_bullet_line(ln)), None)
+        # Normalize each line once; bullet detection, title detection and prefix stripping all reuse it
+        normalized = [_normalize_bullet_line(ln) for ln in lines]
+        bullet_start = next((i for i, norm in enumerate(normalized) if _is_normalized_bullet(norm)), None)
         if bullet_start is not None and bullet_start < len(lines):
             non_bullet = lines[:bullet_start]
             bullet_lines: list[str] = []
@@ -193,7 +260,8 @@ def _parse_blocks(text: str) -> list[tuple[str, str]]:
                 if not ln.strip():
                     i += 1
                     continue
-                if _looks_like_job_or_project_title(ln):
+                is_bullet = _is_normalized_bullet(normalized[i])
+                if _looks_like_job_or_project_title(ln, is_bullet):
                     if non_bullet or bullet_lines:
                         if non_bullet:
                             blocks.append(("job_title", " ".join(non_bullet)))
@@ -203,8 +271,8 @@ def _parse_blocks(text: str) -> list[tuple[str, str]]:
                     bullet_lines = []
                     i += 1
                     continue
-                if _is_bullet_line(ln):
-                    bullet_lines.append(_strip_bullet_prefix(ln))
+                if is_bullet:
+                    bullet_lines.append(_strip_normalized_bullet(normalized[i]))
                 else:
                     bullet_lines.append(ln.strip())
                 i += 1
@@ -218,13 +286,13 @@ def _parse_blocks(text: str) -> list[tuple[str, str]]:
         content = " ".join(lines)
         if content:
             blocks.append(("body", content))
-    return blocks
+    return tuple(blocks)
 
 
 def _block_to_flowables(
     block_type: str,
     content: str,
-    styles: dict[str, ParagraphStyle],
+    styles: Mapping[str, ParagraphStyle],
 ) -> list:
     content = _bold_to_xml(content)
     if block_type == "title":
@@ -253,6 +321,36 @@ def _block_to_flowables(
 
 def text_to_pdf_bytes(resume_text: str) -> bytes:
     """Render resume text as a professional one-page PDF with sections, headers, and bullets."""
+    return _blocks_to_pdf_bytes(_parse_blocks(resume_text))
+
+
+def _structured_resume_blocks(resume: Mapping[str, Any]) -> tuple[tuple[str, str], ...]:
+    """Blocks for a structured resume, matching what _parse_blocks yields for its resume_to_text rendering."""
+    blocks: list[tuple[str, str]] = [("title", " ".join(str(resume.get("name") or "").split()))]
+    contact = " | ".join(c for c in (" ".join(str(v).split()) for v in resume.get("contact") or ()) if c)
+    if contact:
+        blocks.append(("contact", contact))
+    summary = " ".join(str(resume.get("summary") or "").split())
+    if summary:
+        blocks += [("section", "SUMMARY"), ("body", summary)]
+    for heading, entries in ordered_sections(resume):
+        blocks.append(("section", heading))
+        for title, lines in entries:
+            if not lines:
+                blocks.append(("body", title))
+                continue
+            if title:
+                blocks.append(("job_title", title))
+            blocks.extend(("bullet", line) for line in lines)
+    return tuple(blocks)
+
+
+def structured_resume_to_pdf_bytes(resume: Mapping[str, Any]) -> bytes:
+    """Render a structured (JSON) tailored resume straight from its fields, skipping the text parser."""
+    return _blocks_to_pdf_bytes(_structured_resume_blocks(resume))
+
+
+def _blocks_to_pdf_bytes(blocks: tuple[tuple[str, str], ...]) -> bytes:
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
         buffer,
@@ -262,10 +360,8 @@ def text_to_pdf_bytes(resume_text: str) -> bytes:
         topMargin=0.2 * inch,
         bottomMargin=0.2 * inch,
     )
-    base = getSampleStyleSheet()
-    styles = _build_styles(base)
+    styles = _get_styles()
 
-    blocks = _parse_blocks(resume_text)
     flowables: list = []
 
     i = 0
@@ -294,109 +390,103 @@ def text_to_pdf_bytes(resume_text: str) -> bytes:
     return buffer.read()
 
 
-def _find_ul_ranges(s: str) -> list[tuple[int, int]]:
-    """Return (start, end) of each top-level <ul>...</ul> block; inner <ul> skips to matching </ul>."""
-    ranges: list[tuple[int, int]] = []
-    i = 0
-    while i < len(s):
-        ul_open = re.search(r"<ul[^>]*>", s[i:], re.IGNORECASE)
-        if not ul_open:
-            break
-        start = i + ul_open.start()
-        j = i + ul_open.end()
-        depth = 1
-        while depth > 0 and j < len(s):
-            next_ul = re.search(r"<ul[^>]*>", s[j:], re.IGNORECASE)
-            next_end = re.search(r"</ul>", s[j:], re.IGNORECASE)
-            pos_ul = next_ul.start() if next_ul else len(s) + 1
-            pos_end = next_end.start() if next_end else len(s) + 1
-            if pos_end < pos_ul:
-                depth -= 1
-                j += next_end.end()
-                if depth == 0:
-                    ranges.append((start, j))
-                    break
-            else:
-                depth += 1
-                j += next_ul.end()
-        i = j
-    return ranges
+_ALIGN_VALUES = ("left", "center", "right", "justify")
+# (kind, payload): p/h2 -> read-only {"text", "align"}; ul -> tuple of item HTML
+_HtmlBlock = tuple[str, Mapping[str, str | None] | tuple[str, ...]]
+# Container tags we descend into when looking for block elements (TipTap may wrap content)
+_HTML_BLOCK_TAGS = ("p", "h2")
+_HTML_LIST_TAGS = ("ul",)
+
+
+def _html_block_align(node: LexborNode) -> str | None:
+    """Read TipTap alignment from `style="text-align: ..."` or `data-text-align="..."`."""
+    attrs = node.attributes
+    m_align = _ALIGN_STYLE_RE.search(attrs.get("style") or "")
+    if m_align:
+        return m_align.group(1).lower()
+    data_align = (attrs.get("data-text-align") or "").lower()
+    return data_align if data_align in _ALIGN_VALUES else None
 
 
-def _parse_simple_html_to_blocks(html_content: str) -> list[tuple[str, str | dict[str, str | None] | list[str]]]:
+def _html_list_items(ul: LexborNode) -> list[str]:
+    """Inline HTML of each <li> in a list; nested lists are flattened after their parent item."""
+    items: list[str] = []
+    for li in ul.iter():
+        if li.tag != "li":
+            continue
+        parts: list[str] = []
+        inline = ""
+        nested: list[LexborNode] = []
+        for child in li.iter(include_text=True):
+            if child.tag in _HTML_LIST_TAGS:
+                nested.append(child)
+            elif child.tag == "p":
+                parts.append(inline)
+                parts.append(child.inner_html)
+                inline = ""
+            else:
+                inline += child.html or ""
+        parts.append(inline)
+        text = " ".join(part.strip() for part in parts if part.strip())
+        if text:
+            items.append(text)
+        for child_ul in nested:
+            items.extend(_html_list_items(child_ul))
+    return items
+
+
+def _collect_html_blocks(node: LexborNode, blocks: list[_HtmlBlock]) -> None:
+    for child in node.iter():
+        if child.tag in _HTML_BLOCK_TAGS:
+            inner = (child.inner_html or "").strip()
+            if inner:
+                blocks.append((child.tag, MappingProxyType({"text": inner, "align": _html_block_align(child)})))
+        elif child.tag in _HTML_LIST_TAGS:
+            li_items = _html_list_items(child)
+            if li_items:
+                blocks.append(("ul", tuple(li_items)))
+        else:
+            _collect_html_blocks(child, blocks)
+
+
+@lru_cache(maxsize=128)
+def _parse_simple_html_to_blocks(html_content: str) -> tuple[_HtmlBlock, ...]:
     """Extract block-level elements (p, h2, ul/li) in document order.
 
     - Captures text-align from TipTap (`style="text-align: ..."` or `data-text-align="..."`)
       for <p> and <h2> so alignment can be reflected in the PDF.
-    - Skips <p>/<h2> inside <ul> to avoid duplicate text.
+    - <p> inside <li> is treated as the item's text, not as a separate paragraph.
+    - Memoized like _parse_blocks; payloads are read-only mappings/tuples so cached results can be shared.
     """
-    s = html_content.strip()
-    for tag in ("<div>", "</div>", "<body>", "</body>"):
-        s = s.replace(tag, "")
-    ul_ranges = _find_ul_ranges(s)
-
-    def inside_ul(pos: int) -> bool:
-        return any(start <= pos < end for start, end in ul_ranges)
-
-    ordered: list[tuple[int, str, str | dict[str, str | None] | list[str]]] = []
-    for m in re.finditer(r"<p([^>]*)>(.*?)</p>", s, re.DOTALL | re.IGNORECASE):
-        if inside_ul(m.start()):
-            continue
-        attrs = m.group(1) or ""
-        inner = m.group(2).strip()
-        align: str | None = None
-        m_align = re.search(r"text-align\s*:\s*(left|center|right|justify)", attrs, re.IGNORECASE)
-        if not m_align:
-            m_align = re.search(r'data-text-align=["\'](left|center|right|justify)["\']', attrs, re.IGNORECASE)
-        if m_align:
-            align = m_align.group(1).lower()
-        if inner:
-            ordered.append((m.start(), "p", {"text": inner, "align": align}))
-    for m in re.finditer(r"<h2([^>]*)>(.*?)</h2>", s, re.DOTALL | re.IGNORECASE):
-        if inside_ul(m.start()):
-            continue
-        attrs = m.group(1) or ""
-        inner = m.group(2).strip()
-        align: str | None = None
-        m_align = re.search(r"text-align\s*:\s*(left|center|right|justify)", attrs, re.IGNORECASE)
-        if not m_align:
-            m_align = re.search(r'data-text-align=["\'](left|center|right|justify)["\']', attrs, re.IGNORECASE)
-        if m_align:
-            align = m_align.group(1).lower()
-        if inner:
-            ordered.append((m.start(), "h2", {"text": inner, "align": align}))
-    for start, end in ul_ranges:
-        ul_inner = s[start:end]
-        ul_inner = re.sub(r"^<ul[^>]*>", "", ul_inner, count=1, flags=re.IGNORECASE)
-        ul_inner = re.sub(r"</ul>\s*$", "", ul_inner, flags=re.IGNORECASE)
-        li_items = []
-        for m in re.finditer(r"<li[^>]*>(.*?)</li>", ul_inner, re.DOTALL | re.IGNORECASE):
-            raw = m.group(1).strip()
-            if not raw:
-                continue
-            raw = re.sub(r"^<p[^>]*>", "", raw, flags=re.IGNORECASE)
-            raw = re.sub(r"</p>\s*$", "", raw, flags=re.IGNORECASE)
-            li_items.append(raw.strip())
-        if li_items:
-            ordered.append((start, "ul", li_items))
-    ordered.sort(key=lambda x: x[0])
-    blocks = [(k, v) for _, k, v in ordered]
-    if not blocks and s:
-        blocks = [("p", {"text": s, "align": None})]
-    return blocks
+    body = LexborHTMLParser(html_content.strip()).body
+    if body is None:
+        return ()
+    blocks: list[_HtmlBlock] = []
+    _collect_html_blocks(body, blocks)
+    if not blocks:
+        fallback = (body.inner_html or "").strip()
+        if fallback:
+            blocks = [("p", MappingProxyType({"text": fallback, "align": None}))]
+    return tuple(blocks)
+
+
+def _html_inline_token(m: re.Match[str]) -> str:
+    bold = m.group(1)
+    if bold is not None:
+        return f"<b>{_HTML_INLINE_RE.sub(_html_inline_token, bold)}</b>"
+    token = m.group(0)
+    if token == "&":
+        return "&amp;"
+    return _HTML_INLINE_TAGS[token.lower()]
 
 
 def _html_inline_to_reportlab(html: str) -> str:
-    """Convert to ReportLab Paragraph XML: ** to bold, preserve <b>/<i>/<u>, fix & escaping."""
-    s = html
-    # Convert literal **...** to <b> so titles/names from plain text or editor render bold
-    s = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", s, flags=re.DOTALL)
-    s = _escape_amp_for_reportlab(s)
-    s = re.sub(r"<strong>", "<b>", s)
-    s = re.sub(r"</strong>", "</b>", s)
-    s = re.sub(r"<em>", "<i>", s)
-    s = re.sub(r"</em>", "</i>", s)
-    return s
+    """Convert to ReportLab Paragraph XML: ** to bold, preserve <b>/<i>/<u>/<br>, fix & escaping.
+
+    Literal **...** becomes <b> so titles/names from plain text or editor render bold; all rewrites
+    happen in a single regex scan.
+    """
+    return _HTML_INLINE_RE.sub(_html_inline_token, html)
 
 
 def html_to_pdf_bytes(html_content: str) -> bytes:
@@ -412,34 +502,12 @@ def html_to_pdf_bytes(html_content: str) -> bytes:
         topMargin=0.2 * inch,
         bottomMargin=0.2 * inch,
     )
-    base = getSampleStyleSheet()
-    styles = _build_styles(base)
+    styles = _get_styles()
     flowables: list = []
 
-    def _style_with_alignment(base_style: ParagraphStyle, align: str | None) -> ParagraphStyle:
-        """Return a ParagraphStyle based on base_style but with the given text alignment."""
-        if not align:
-            return base_style
-        align_lower = align.lower()
-        alignment_value = base_style.alignment
-        if align_lower == "left":
-            alignment_value = 0
-        elif align_lower == "center":
-            alignment_value = 1
-        elif align_lower == "right":
-            alignment_value = 2
-        elif align_lower == "justify":
-            alignment_value = 4
-        # Create a lightweight derived style so we don't mutate shared styles
-        return ParagraphStyle(
-            f"{base_style.name}-{align_lower}",
-            parent=base_style,
-            alignment=alignment_value,
-        )
-
     for i, (kind, payload) in enumerate(blocks):
         if kind == "p":
-            if isinstance(payload, dict):
+            if isinstance(payload, Mapping):
                 raw_text = str(payload.get("text", "") or "")
                 align = payload.get("align")
             else:
@@ -447,19 +515,17 @@ def html_to_pdf_bytes(html_content: str) -> bytes:
                 align = None
             text = _html_inline_to_reportlab(raw_text)
             # First paragraph is typically the name — use title style (13pt)
-            base_style = styles["title"] if i == 0 else styles["body"]
-            style = _style_with_alignment(base_style, align)
+            style = _style_with_alignment("title" if i == 0 else "body", align)
             flowables.append(Paragraph(text or " ", style))
         elif kind == "h2":
-            if isinstance(payload, dict):
+            if isinstance(payload, Mapping):
                 raw_text = str(payload.get("text", "") or "")
                 align = payload.get("align")
             else:
                 raw_text = str(payload or "")
                 align = None
             text = _html_inline_to_reportlab(raw_text)
-            base_style = styles["section"]
-            style = _style_with_alignment(base_style, align)
+            style = _style_with_alignment("section", align)
             flowables.append(Paragraph(f"<b>{text}</b>", style))
             flowables.append(HRFlowable(width="100%", thickness=0.5, color=colors.HexColor("#333333")))
             flowables.append(Spacer(1, 4))
@@ -483,8 +549,7 @@ def cover_letter_text_to_pdf_bytes(cover_letter_text: str) -> bytes:
         topMargin=0.75 * inch,
         bottomMargin=0.75 * inch,
     )
-    base = getSampleStyleSheet()
-    styles = _build_styles(base)
+    styles = _get_styles()
     flowables: list = []
     paragraphs = [p.strip() for p in cover_letter_text.split("\n\n") if p.strip()]
     for para in paragraphs:
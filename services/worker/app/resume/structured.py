@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import orjson
+
+# A tailored resume as returned by the model under a strict json_schema response_format. Strict mode needs every
+# property listed as required, so absent values come back as "" or [].
+# other_sections catches anything else on the resume (awards, publications, volunteering, languages...)
+SECTION_KEYS = ("experience", "projects", "skills", "education", "certifications", "other_sections")
+
+_STR = {"type": "string"}
+_STR_LIST = {"type": "array", "items": _STR}
+
+
+def _object(**properties: Any) -> dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _list_of(**properties: Any) -> dict[str, Any]:
+    return {"type": "array", "items": _object(**properties)}
+
+
+TAILORED_RESUME_SCHEMA = _object(
+    name=_STR,
+    contact=_STR_LIST,
+    summary=_STR,
+    section_order={"type": "array", "items": {"type": "string", "enum": list(SECTION_KEYS)}},
+    experience=_list_of(title=_STR, company=_STR, location=_STR, dates=_STR, bullets=_STR_LIST),
+    projects=_list_of(name=_STR, link=_STR, bullets=_STR_LIST),
+    skills=_list_of(category=_STR, items=_STR_LIST),
+    education=_list_of(degree=_STR, school=_STR, location=_STR, dates=_STR, details=_STR_LIST),
+    certifications=_STR_LIST,
+    other_sections=_list_of(heading=_STR, bullets=_STR_LIST),
+)
+
+TAILORED_RESUME_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "tailored_resume", "strict": True, "schema": TAILORED_RESUME_SCHEMA},
+}
+
+_SECTION_HEADINGS = {
+    "experience": "EXPERIENCE",
+    "projects": "PROJECTS",
+    "skills": "SKILLS",
+    "education": "EDUCATION",
+    "certifications": "CERTIFICATIONS",
+}
+
+
+def parse_tailored_resume(content: str) -> dict[str, Any]:
+    """Decode the model's JSON resume; raises ValueError when it is not a usable resume object."""
+    try:
+        resume = orjson.loads(content)
+    except orjson.JSONDecodeError as e:
+        raise ValueError("OpenAI returned malformed JSON for the tailored resume") from e
+    if not isinstance(resume, dict) or not str(resume.get("name") or "").strip():
+        raise ValueError("OpenAI returned no text for the tailored resume")
+    return resume
+
+
+def _clean(value: Any) -> str:
+    # Collapse stray newlines/indentation so every value stays on one rendered line
+    return " ".join(str(value or "").split())
+
+
+def _clean_list(values: Any) -> list[str]:
+    return [text for text in (_clean(v) for v in values or ()) if text]
+
+
+def _headline(*parts: Any) -> str:
+    """"**Title** | Company | Location | Dates" with the lead field bold, as the editor shows it.
+
+    A lone field stays plain: a fully bold line ("**...**") is parsed as a section heading. Multi-field
+    headlines always contain "|", which keeps an all-caps one from being read as a heading.
+    """
+    fields = [text for text in (_clean(p) for p in parts) if text]
+    if len(fields) > 1:
+        fields[0] = f"**{fields[0]}**"
+    return " | ".join(fields)
+
+
+def _section_entries(resume: Mapping[str, Any], key: str) -> list[tuple[str, list[str]]]:
+    """(heading, bullet lines) per entry of a section, in resume order; heading may be empty."""
+    if key == "experience":
+        return [
+            (_headline(e.get("title"), e.get("company"), e.get("location"), e.get("dates")), _clean_list(e.get("bullets")))
+            for e in resume.get("experience") or ()
+        ]
+    if key == "projects":
+        return [(_headline(p.get("name"), p.get("link")), _clean_list(p.get("bullets"))) for p in resume.get("projects") or ()]
+    if key == "education":
+        return [
+            (_headline(e.get("degree"), e.get("school"), e.get("location"), e.get("dates")), _clean_list(e.get("details")))
+            for e in resume.get("education") or ()
+        ]
+    if key == "skills":
+        lines = []
+        for group in resume.get("skills") or ():
+            items = ", ".join(_clean_list(group.get("items")))
+            category = _clean(group.get("category"))
+            if items:
+                lines.append(f"{category}: {items}" if category else items)
+        return [("", lines)] if lines else []
+    if key == "certifications":
+        certs = _clean_list(resume.get("certifications"))
+        return [("", certs)] if certs else []
+    return []
+
+
+def ordered_sections(resume: Mapping[str, Any]) -> list[tuple[str, list[tuple[str, list[str]]]]]:
+    """Non-empty sections as (HEADING, entries), in the model's section_order followed by any it left out."""
+    order = [k for k in resume.get("section_order") or () if k in SECTION_KEYS]
+    order = list(dict.fromkeys(order + list(SECTION_KEYS)))
+    sections = []
+    for key in order:
+        if key == "other_sections":
+            for other in resume.get("other_sections") or ():
+                # Upper-cased so the text parser recognizes the heading like the fixed ones
+                heading, lines = _clean(other.get("heading")).upper(), _clean_list(other.get("bullets"))
+                if heading and lines:
+                    sections.append((heading, [("", lines)]))
+            continue
+        entries = [
+            # A lone all-caps field (e.g. school "MIT") would parse as a section heading; list it with the lines
+            ("", [heading, *lines]) if heading.isupper() and "|" not in heading else (heading, lines)
+            for heading, lines in _section_entries(resume, key)
+            if heading or lines
+        ]
+        if entries:
+            sections.append((_SECTION_HEADINGS[key], entries))
+    return sections
+
+
+def resume_to_text(resume: Mapping[str, Any]) -> str:
+    """Render a structured resume in the plain-text format the editor and text_to_pdf_bytes understand.
+
+    The name stays unbolded: a "**Name**" first line is parsed as a section header rather than the title.
+    """
+    header = [_clean(resume.get("name"))]
+    contact = " | ".join(_clean_list(resume.get("contact")))
+    if contact:
+        header.append(contact)
+    blocks = ["\n".join(header)]
+    summary = _clean(resume.get("summary"))
+    if summary:
+        blocks.append(f"SUMMARY\n{summary}")
+    for heading, entries in ordered_sections(resume):
+        blocks.append(heading)
+        for title, lines in entries:
+            blocks.append("\n".join(([title] if title else []) + [f"- {line}" for line in lines]))
+    return "\n\n".join(blocks)
@@ -1,145 +1,647 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
 import re
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterable
 
-from openai import OpenAI
-
-
-RESUME_TAILOR_SYSTEM = """You are an expert resume writer specializing in cybersecurity and technical roles. Your task is to rewrite the candidate's resume to optimize it for a specific job description while maintaining authenticity and impact.
-
-## CORE RULES (NEVER VIOLATE):
-
-1. **NO FABRICATION**: Do NOT add any experience, job, skill, certification, project, or achievement that is not present in the original resume. Only rephrase, reorder, or emphasize what already exists. If the job asks for something the candidate lacks, omit it rather than inventing it.
-
-2. **PRESERVE TRUTH**: All dates, companies, titles, and core facts must remain accurate. You may reframe how experience is described, but never change what actually happened.
-
-## OPTIMIZATION GUIDELINES:
-
-### A. ATS KEYWORD INTEGRATION:
-- Extract critical keywords and phrases from the job description
-- Integrate them naturally into the resume where they honestly apply to the candidate's real experience
-- Use exact wording from the job description when possible (e.g., if JD says "threat modeling," use "threat modeling" not "security assessment")
-- Avoid keyword stuffing: integrate terms naturally into complete sentences
-- Never add keywords in parentheses like "(keyword1, keyword2, keyword3)" - weave them into the narrative
-- Prioritize keywords that appear multiple times in the JD or appear in the "required qualifications" section
-
-### B. BULLET STRUCTURE - CAR FRAMEWORK:
-Every experience bullet should follow the Context-Action-Result pattern:
-- **Context**: Brief setup (what was the situation/problem/need)
-- **Action**: What the candidate did (use strong action verbs)
-- **Result**: The measurable impact or outcome
-
-Example:
-❌ BAD: "Built a security automation platform using Node.js"
-✅ GOOD: "Architected security automation platform serving 50+ customers, reducing manual compliance workflows by 40% and audit prep time from 3 weeks to 3 days"
-
-### C. QUANTIFICATION REQUIREMENTS:
-- Add or emphasize existing metrics whenever possible
-- Look for implicit scale in the original resume and make it explicit
-- If original says "built a platform," check if you can add "serving X customers" or "processing Y requests"
-- Include percentages, time savings, accuracy rates, number of users/systems/controls
-- If no metrics exist in original, do NOT invent them - focus on qualitative impact instead
-
-### D. ACTION VERB STRENGTH:
-Replace weak verbs with stronger alternatives:
-- Tier 1 (Best): Architected, Engineered, Built, Designed, Led, Spearheaded, Established
-- Tier 2 (Good): Developed, Implemented, Created, Optimized, Automated
-- Tier 3 (Avoid): Worked on, Helped with, Assisted, Supported, Participated in, Responsible for
-
-Start each bullet with a Tier 1 or Tier 2 verb.
-
-### E. SUMMARY SECTION:
-Write a concise 2 sentence professional summary that:
-- Starts with job title + specialization that matches the target role
-- Includes the candidate's most impressive quantifiable achievement (if available)
-- Highlights 2-3 key strengths that align with job requirements
-- Mentions years of relevant experience
-
-Example structure:
-"[Job Title] specializing in [key area from JD] with [X years] experience in [relevant domain]. [Most impressive achievement with metric]. Strong background in [skill 1], [skill 2], and [skill 3 from JD]."
-
-### F. SKILLS SECTION OPTIMIZATION:
-- Reorganize skills into 4-5 clear categories (not 7+)
-- Prioritize skills mentioned in job description (list them first)
-- Remove duplicates across categories
-- Use job description's exact terminology for skills when possible
-- Group related skills logically
-
-### G. PROJECT SECTION:
-- For each project, lead with the outcome or value, not just what was built
-- If project name matches a GitHub repo, include the link
-- Focus on 2-3 most relevant projects that align with JD
-
-### H. FORMATTING & STYLE:
-- Keep bullets to 1.5-2 lines maximum (no longer)
-- Avoid jargon that isn't in the original resume or job description
-- Maintain professional tone throughout
-- Use consistent verb tense (past for previous roles, present for current role)
-- Ensure parallel structure in bullet lists
-- Format all dates as "Month YYYY" (e.g. "Jan 2023", "Mar 2022 – Present"). Never use MM/YYYY or year-only formats — ATS parsers require month + year to correctly calculate tenure.
-- Keep the resume to ONE PAGE. If content overflows, prioritize: (1) Summary, (2) most recent 2 jobs, (3) Skills, (4) Education, (5) older jobs/projects. Cut bullets from older roles before dropping sections.
-
-## QUALITY CHECKS:
-
-Before finalizing, verify:
-1. ✓ Every bullet has a quantifiable result OR clear qualitative impact
-2. ✓ Job description keywords appear naturally (not stuffed)
-3. ✓ No parenthetical keyword lists like "(skill1, skill2, skill3)"
-4. ✓ Strong action verbs (mostly Tier 1-2)
-5. ✓ Summary is 2-3 sentences and compelling
-6. ✓ All information is accurate to original resume
-7. ✓ Skills section is organized and prioritized by relevance
-8. ✓ All dates use "Month YYYY" format
-9. ✓ Content fits on one page (prefer cutting older role bullets over truncating recent ones)
-
-Output only the tailored resume text. Format it so it can be rendered as a professional PDF:
-- Put the candidate name at the top (bold with **Name**), then contact info on the next line (email, phone, location, LinkedIn, etc., separated by |).
-- Use section headings in ALL CAPS on their own line: SUMMARY, EXPERIENCE, EDUCATION, SKILLS, PROJECTS, CERTIFICATIONS (as applicable).
-- Use bullet points consistently: start every responsibility and achievement with a hyphen and space (- ). Do not use • or other bullet characters.
-- Use **bold** for job titles, company names, and degree names. No meta-commentary."""
-
-
-def tailor_resume(resume_text: str, job_description: str, api_key: str | None = None) -> str:
+import orjson
+from openai import AsyncOpenAI, NotFoundError, OpenAI, Timeout
+
+from app.resume.cache import EMBEDDING_MODEL, tailor_cache
+from app.resume.structured import (
+    TAILORED_RESUME_RESPONSE_FORMAT,
+    TAILORED_RESUME_SCHEMA,
+    parse_tailored_resume,
+    resume_to_text,
+)
+from app.resume.usage import record_usage
+
+logger = logging.getLogger(__name__)
+
+# Chat model for all generation; OPENAI_TAILOR_MODEL overrides it for resume tailoring
+DEFAULT_MODEL = "gpt-5.2"
+# Resume + JD size (chars) up to which tailoring may use OPENAI_TAILOR_LIGHT_MODEL when that is set
+LIGHT_MODEL_MAX_CHARS = 8000
+
+
+# ~650 tokens, held under 4800 chars (~1200 tokens) by tests/test_tailor.py. That is below OpenAI's 1024-token
+# minimum for prompt caching, so a cached prefix only forms once the start of the resume carries the request
+# past it; a first-time resume always reports cached_tokens=0.
+RESUME_TAILOR_SYSTEM = """You rewrite a candidate's resume (cybersecurity/technical roles) to fit a specific job description.
+
+## CORE RULES (NEVER VIOLATE)
+- No fabrication: never add experience, jobs, skills, certifications, projects, achievements or metrics absent from the original. Only rephrase, reorder, emphasize. If the job asks for something the candidate lacks, omit it.
+- Keep all dates, companies, titles and facts accurate.
+
+## KEYWORDS
+- Use the job description's exact wording for skills and duties the candidate genuinely has (e.g. "threat modeling", not "security assessment").
+- Prioritize terms repeated in the JD or listed under required qualifications.
+- Weave keywords into sentences; no stuffing, no parenthetical keyword lists like "(skill1, skill2)".
+
+## BULLETS
+- Context-Action-Result: brief context, what the candidate did, measurable outcome.
+- Start with a strong verb. Prefer: Architected, Engineered, Built, Designed, Led, Spearheaded, Established, Developed, Implemented, Created, Optimized, Automated. Avoid: worked on, helped with, assisted, supported, participated in, responsible for.
+- Surface existing metrics and implicit scale (users, customers, requests, %, time saved, controls). With no metric in the original, state qualitative impact instead.
+- 1.5-2 lines max; parallel structure; past tense for previous roles, present for the current one.
+
+## SECTIONS
+- SUMMARY: 2 sentences. Target job title + specialization, years of relevant experience, strongest quantified achievement, 2-3 strengths matching the JD.
+- SKILLS: 4-5 categories, JD-matching skills first, JD terminology, no duplicates.
+- PROJECTS: the 2-3 most relevant; lead with the outcome; include the GitHub link when the project name matches a repo.
+
+## STYLE
+- Professional tone; no jargon absent from the resume or JD.
+- Dates as "Month YYYY" (e.g. "Jan 2023", "Mar 2022 – Present"); never MM/YYYY or year only.
+- ONE PAGE. When trimming, keep in order: Summary, 2 most recent jobs, Skills, Education, older jobs/projects. Cut older-role bullets before dropping sections.
+
+## INPUT
+The user message has the current resume after "RESUME:" and the target job description after "JOB:".
+
+## OUTPUT
+No meta-commentary. With a JSON schema, fill its fields with plain text (no markdown, no bullet characters), put any other resume section (awards, publications, volunteering, languages...) in other_sections, list sections in section_order by relevance to the job, and use "" or [] for anything the resume lacks.
+Otherwise, plain text: first line the name, next line contact info separated by |; ALL CAPS section headings on their own line; every bullet starts with "- "."""
+
+
+# The SDK retries 408/409/429/5xx, timeouts and dropped connections with jittered exponential backoff and
+# honours Retry-After; a few more attempts than its default of 2 rides out rate-limit bursts.
+OPENAI_MAX_RETRIES = 5
+# Fail fast on connect, but leave room for a reasoning model to write a full resume
+OPENAI_TIMEOUT = Timeout(120.0, connect=5.0)
+
+
+@lru_cache(maxsize=4)
+def _get_client(api_key: str) -> OpenAI:
+    """Shared sync client per API key; the SDK's default pool (1000 conns / 100 keep-alive) is already large enough."""
+    return OpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES, timeout=OPENAI_TIMEOUT)
+
+
+@lru_cache(maxsize=4)
+def _get_async_client(api_key: str) -> AsyncOpenAI:
+    """Shared async client per API key so its connection pool (keep-alive TCP + TLS) is reused across requests."""
+    return AsyncOpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES, timeout=OPENAI_TIMEOUT)
+
+
+# Routes tailoring calls to the same prompt-cache shard and namespaces cached results; bump when
+# RESUME_TAILOR_SYSTEM or the resume schema changes so stale results are never served
+TAILOR_PROMPT_CACHE_KEY = "resume-tailor-v5"
+# Output ceiling for one tailored resume. gpt-5.2 counts reasoning tokens against it too, so this leaves room
+# for reasoning on top of the ~700-900 visible tokens a one-page resume needs while still cutting off runaways.
+TAILOR_MAX_COMPLETION_TOKENS = 2500
+
+
+# Input budgets in characters (~4 chars per token: ~3000 resume tokens, ~2000 JD tokens)
+MAX_RESUME_CHARS = 12_000
+MAX_JD_CHARS = 8_000
+# Share of the resume budget kept from the top (contact, summary, most recent roles); the rest comes from the end
+_RESUME_HEAD_SHARE = 0.7
+
+_BLANK_LINE_RE = re.compile(r"\n\s*\n")
+_JD_PRIORITY_RE = re.compile(r"requir|qualifications|responsibilit|what you.ll do|skills|experience", re.IGNORECASE)
+_JD_FLUFF_RE = re.compile(
+    r"about (us|the company|the team)|who we are|benefits|perks|equal opportunity|compensation|salary|pay range",
+    re.IGNORECASE,
+)
+
+
+def _truncate_resume(resume_text: str) -> str:
+    """Drop the middle of an oversized resume at line boundaries, keeping the top and the end."""
+    if len(resume_text) <= MAX_RESUME_CHARS:
+        return resume_text
+    head = resume_text[: int(MAX_RESUME_CHARS * _RESUME_HEAD_SHARE)].rsplit("\n", 1)[0]
+    tail = resume_text[len(resume_text) - (MAX_RESUME_CHARS - len(head)) :].split("\n", 1)[-1]
+    logger.info("Truncated resume from %d to %d characters", len(resume_text), len(head) + len(tail))
+    return f"{head}\n\n{tail}"
+
+
+def _jd_sections(job_description: str) -> list[str]:
+    """Blank-line separated blocks, with a lone heading line attached to the block after it.
+
+    Every heading line starts its own section, so in a run of short lines ("Compensation", "$150,000",
+    "Responsibilities") only the last one joins the body and each is ranked by its own text.
+    """
+    sections: list[str] = []
+    heading = ""
+    for block in _BLANK_LINE_RE.split(job_description.strip()):
+        block = block.strip()
+        if "\n" not in block and len(block) <= 60 and not block.endswith("."):
+            if heading:
+                sections.append(heading)
+            heading = block
+            continue
+        sections.append(f"{heading}\n{block}" if heading else block)
+        heading = ""
+    if heading:
+        sections.append(heading)
+    return sections
+
+
+def _truncate_lines(text: str, limit: int) -> str:
+    """Longest run of whole leading lines within limit; a hard cut if even the first line is too long."""
+    cut = text[: limit + 1].rsplit("\n", 1)[0] if len(text) > limit else text
+    return cut if len(cut) <= limit else text[: max(limit, 0)]
+
+
+def _truncate_job_description(job_description: str) -> str:
+    """Fit an oversized JD in budget: requirements/responsibilities first, company boilerplate last."""
+    if len(job_description) <= MAX_JD_CHARS:
+        return job_description
+    sections = _jd_sections(job_description)
+
+    def rank(i: int) -> tuple[int, int]:
+        # Ranked by the section's heading (its first line); only a non-priority fluff heading is ever skipped
+        heading = sections[i].split("\n", 1)[0]
+        if _JD_PRIORITY_RE.search(heading):
+            return 0, i
+        return (2 if _JD_FLUFF_RE.search(heading) else 1), i
+
+    kept: dict[int, str] = {}
+    used = 0
+    for i in sorted(range(len(sections)), key=rank):
+        remaining = MAX_JD_CHARS - used - 2 * len(kept)
+        if len(sections[i]) <= remaining:
+            kept[i] = sections[i]
+            used += len(sections[i])
+            continue
+        if rank(i)[0] == 2:
+            continue
+        # Ranked order means everything below is lower priority: cut this section to fit and stop, rather
+        # than skip it and fill the budget with boilerplate
+        kept[i] = _truncate_lines(sections[i], remaining)
+        break
+    truncated = "\n\n".join(kept[i] for i in sorted(kept) if kept[i]) or job_description[:MAX_JD_CHARS]
+    logger.info("Truncated job description from %d to %d characters", len(job_description), len(truncated))
+    return truncated
+
+
+# Built once and shared by every call (never mutated). All fixed instructions live in the system prompt so
+# the cacheable prefix stops right at the resume.
+_TAILOR_SYSTEM_MESSAGE = {"role": "system", "content": RESUME_TAILOR_SYSTEM}
+# Bound str.format of a module-level template: C-level formatting, no per-call f-string assembly
+_build_tailor_user = "RESUME:\n{resume}\n\nJOB:\n{job}".format
+
+
+def _tailor_messages(resume_text: str, job_description: str) -> list[dict[str, str]]:
+    return [
+        _TAILOR_SYSTEM_MESSAGE,
+        {
+            "role": "user",
+            "content": _build_tailor_user(
+                resume=_truncate_resume(resume_text),
+                job=_truncate_job_description(job_description),
+            ),
+        },
+    ]
+
+
+def _tailor_model(resume_text: str, job_description: str, model: str | None = None) -> str:
+    if model:
+        return model
+    light_model = os.getenv("OPENAI_TAILOR_LIGHT_MODEL")
+    if light_model and len(resume_text) + len(job_description) <= LIGHT_MODEL_MAX_CHARS:
+        return light_model
+    return os.getenv("OPENAI_TAILOR_MODEL") or DEFAULT_MODEL
+
+
+def _cache_key(model: str, resume_text: str, job_description: str) -> str:
+    return tailor_cache.key(model, TAILOR_PROMPT_CACHE_KEY, resume_text, job_description)
+
+
+def _semantic_scope(model: str, resume_text: str) -> str:
+    # Near-duplicate JDs may only share results for the same candidate, model and prompt version
+    return tailor_cache.key(model, TAILOR_PROMPT_CACHE_KEY, resume_text)
+
+
+def _create_tailor_completion(completions: Any, model: str, **kwargs: Any) -> Any:
+    """completions.create(...) on client.chat.completions or its with_raw_response view, with a model fallback."""
+    try:
+        return completions.create(model=model, **kwargs)
+    except NotFoundError:
+        if model == DEFAULT_MODEL:
+            raise
+        logger.warning("Model %s not found, retrying resume tailoring with %s", model, DEFAULT_MODEL)
+        return completions.create(model=DEFAULT_MODEL, **kwargs)
+
+
+async def _create_tailor_completion_async(completions: Any, model: str, **kwargs: Any) -> Any:
+    try:
+        return await completions.create(model=model, **kwargs)
+    except NotFoundError:
+        if model == DEFAULT_MODEL:
+            raise
+        logger.warning("Model %s not found, retrying resume tailoring with %s", model, DEFAULT_MODEL)
+        return await completions.create(model=DEFAULT_MODEL, **kwargs)
+
+
+# Non-streaming tailoring calls go through with_raw_response and decode the body with orjson: building the SDK's
+# ChatCompletion model costs ~40x more than the decode, and these paths only need a few fields.
+def _tailored_resume(completion: dict[str, Any]) -> dict[str, Any]:
+    choices = completion.get("choices") or []
+    if choices and choices[0].get("finish_reason") == "length":
+        raise ValueError("OpenAI stopped at the output limit before finishing the tailored resume")
+    content = choices[0]["message"].get("content") if choices else None
+    if not content:
+        raise ValueError("OpenAI returned no text for the tailored resume")
+    return parse_tailored_resume(content)
+
+
+def tailor_resume(
+    resume_text: str,
+    job_description: str,
+    api_key: str | None = None,
+    model: str | None = None,
+) -> str:
+    return resume_to_text(tailor_resume_structured(resume_text, job_description, api_key, model))
+
+
+async def tailor_resume_async(
+    resume_text: str,
+    job_description: str,
+    api_key: str | None = None,
+    model: str | None = None,
+) -> str:
+    """Async tailor_resume: awaits the completion on the event loop using a pooled client."""
+    return resume_to_text(await tailor_resume_structured_async(resume_text, job_description, api_key, model))
+
+
+def tailor_resume_structured(
+    resume_text: str,
+    job_description: str,
+    api_key: str | None = None,
+    model: str | None = None,
+) -> dict[str, Any]:
+    """Tailored resume as the TAILORED_RESUME_SCHEMA object, for rendering straight to PDF."""
     api_key = api_key or os.getenv("OPENAI_API_KEY")
     # print(f"API key: {api_key}")
     if not api_key:
         raise ValueError("OPENAI_API_KEY is required for resume tailoring")
 
-    client = OpenAI(api_key=api_key)
+    client = _get_client(api_key)
+
+    model = _tailor_model(resume_text, job_description, model)
+    key = _cache_key(model, resume_text, job_description)
+    cached = tailor_cache.get(key)
+    if cached is not None:
+        return cached
+    embedding = None
+    scope = _semantic_scope(model, resume_text)
+    if tailor_cache.semantic:
+        embedding = client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=tailor_cache.embedding_input(_truncate_job_description(job_description)),
+        ).data[0].embedding
+        cached = tailor_cache.get_similar(scope, embedding)
+        if cached is not None:
+            return cached
+
+    raw = _create_tailor_completion(
+        client.chat.completions.with_raw_response,
+        model,
+        messages=_tailor_messages(resume_text, job_description),
+        prompt_cache_key=TAILOR_PROMPT_CACHE_KEY,
+        max_completion_tokens=TAILOR_MAX_COMPLETION_TOKENS,
+        response_format=TAILORED_RESUME_RESPONSE_FORMAT,
+    )
+    completion = orjson.loads(raw.content)
+    record_usage("tailor", completion.get("model", ""), completion.get("usage"))
+    tailored = _tailored_resume(completion)
+    tailor_cache.put(key, tailored, embedding, scope)
+    return tailored
 
-    user_content = f"""Here is the candidate's current resume:
 
----
-{resume_text}
----
+async def tailor_resume_structured_async(
+    resume_text: str,
+    job_description: str,
+    api_key: str | None = None,
+    model: str | None = None,
+) -> dict[str, Any]:
+    """Async tailor_resume_structured using the pooled client."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY is required for resume tailoring")
 
-Here is the job description to tailor the resume for:
+    client = _get_async_client(api_key)
+
+    model = _tailor_model(resume_text, job_description, model)
+    key = _cache_key(model, resume_text, job_description)
+    cached = await tailor_cache.aget(key)
+    if cached is not None:
+        return cached
+    embedding = None
+    scope = _semantic_scope(model, resume_text)
+    if tailor_cache.semantic:
+        embedding = (
+            await client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=tailor_cache.embedding_input(_truncate_job_description(job_description)),
+            )
+        ).data[0].embedding
+        cached = tailor_cache.get_similar(scope, embedding)
+        if cached is not None:
+            return cached
+
+    raw = await _create_tailor_completion_async(
+        client.chat.completions.with_raw_response,
+        model,
+        messages=_tailor_messages(resume_text, job_description),
+        prompt_cache_key=TAILOR_PROMPT_CACHE_KEY,
+        max_completion_tokens=TAILOR_MAX_COMPLETION_TOKENS,
+        response_format=TAILORED_RESUME_RESPONSE_FORMAT,
+    )
+    completion = orjson.loads(raw.content)
+    record_usage("tailor", completion.get("model", ""), completion.get("usage"))
+    tailored = _tailored_resume(completion)
+    await tailor_cache.aput(key, tailored, embedding, scope)
+    return tailored
 
----
-{job_description}
----
 
-Rewrite the resume according to the rules: ATS keywords from the job, no new experience/skills, one page only. Output only the resume text."""
+async def stream_tailor_resume(
+    resume_text: str,
+    job_description: str,
+    api_key: str | None = None,
+    model: str | None = None,
+) -> AsyncIterator[str]:
+    """Yield the tailored resume in chunks as the model generates it; cached results arrive as one chunk.
 
-    response = client.chat.completions.create(
-        model="gpt-5.2",
+    Streams the plain-text format (a partial JSON object is no use to a reader) and so is not cached.
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY is required for resume tailoring")
+
+    model = _tailor_model(resume_text, job_description, model)
+    cached = await tailor_cache.aget(_cache_key(model, resume_text, job_description))
+    if cached is not None:
+        yield resume_to_text(cached)
+        return
+
+    stream = await _create_tailor_completion_async(
+        _get_async_client(api_key).chat.completions,
+        model,
+        messages=_tailor_messages(resume_text, job_description),
+        prompt_cache_key=TAILOR_PROMPT_CACHE_KEY,
+        max_completion_tokens=TAILOR_MAX_COMPLETION_TOKENS,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    parts: list[str] = []
+    finish_reason = None
+    async for chunk in stream:
+        # The final include_usage chunk carries token counts and no choices
+        if not chunk.choices:
+            record_usage("tailor_stream", chunk.model, chunk.usage)
+            continue
+        finish_reason = chunk.choices[0].finish_reason or finish_reason
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+    if finish_reason == "length":
+        raise ValueError("OpenAI stopped at the output limit before finishing the tailored resume")
+    if not "".join(parts).strip():
+        raise ValueError("OpenAI returned no text for the tailored resume")
+
+
+# Upper bound on in-flight completions from one fan-out, to stay under the account's RPM limit
+TAILOR_CONCURRENCY = 20
+
+
+async def tailor_resumes_async(
+    jobs: Iterable[tuple[str, str]],
+    api_key: str | None = None,
+    concurrency: int = TAILOR_CONCURRENCY,
+) -> list[str]:
+    """Tailor many (resume_text, job_description) pairs concurrently; results keep the input order."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(resume_text: str, job_description: str) -> str:
+        async with semaphore:
+            return await tailor_resume_async(resume_text, job_description, api_key)
+
+    return await asyncio.gather(*(run(r, j) for r, j in jobs))
+
+
+# Resumes per combined same-JD request; keeps each response well inside the model's output limit
+SAME_JD_GROUP_SIZE = 5
+
+_build_same_jd_user = (
+    "JOB:\n{job}\n\n"
+    "Tailor each resume below separately for this job, following every rule. Return one entry per resume "
+    'in "resumes", with its resume number as "id".\n\n'
+    "{resumes}"
+).format
+_SAME_JD_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "tailored_resumes",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "resumes": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"id": {"type": "integer"}, "resume": TAILORED_RESUME_SCHEMA},
+                        "required": ["id", "resume"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["resumes"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+async def _tailor_group_same_jd(
+    client: AsyncOpenAI,
+    resumes: list[str],
+    job_description: str,
+    model: str,
+) -> dict[int, dict[str, Any]]:
+    """One request for several resumes; returns whatever entries came back usable, keyed by position."""
+    numbered = "\n\n".join(f"RESUME {i}:\n{_truncate_resume(resume)}" for i, resume in enumerate(resumes))
+    raw = await _create_tailor_completion_async(
+        client.chat.completions.with_raw_response,
+        model,
         messages=[
-            {"role": "system", "content": RESUME_TAILOR_SYSTEM},
-            {"role": "user", "content": user_content},
+            _TAILOR_SYSTEM_MESSAGE,
+            {"role": "user", "content": _build_same_jd_user(job=_truncate_job_description(job_description), resumes=numbered)},
         ],
+        prompt_cache_key=TAILOR_PROMPT_CACHE_KEY,
+        max_completion_tokens=TAILOR_MAX_COMPLETION_TOKENS * len(resumes),
+        response_format=_SAME_JD_RESPONSE_FORMAT,
     )
-    content = response.choices[0].message.content if response.choices else None
-    if not content:
-        raise ValueError("OpenAI returned no text for the tailored resume")
-    return content.strip()
+    completion = orjson.loads(raw.content)
+    record_usage("tailor_same_jd", completion.get("model", ""), completion.get("usage"))
+    choices = completion.get("choices") or []
+    content = choices[0]["message"].get("content") if choices else None
+    if not content or choices[0].get("finish_reason") == "length":
+        return {}
+    try:
+        entries = orjson.loads(content)["resumes"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        return {}
+    return {
+        entry["id"]: entry["resume"]
+        for entry in entries
+        if isinstance(entry, dict)
+        and isinstance(entry.get("id"), int)
+        and 0 <= entry["id"] < len(resumes)
+        and isinstance(entry.get("resume"), dict)
+        and str(entry["resume"].get("name") or "").strip()
+    }
+
+
+async def tailor_resumes_same_jd(
+    resumes: list[str],
+    job_description: str,
+    api_key: str | None = None,
+    model: str | None = None,
+) -> list[str]:
+    """Tailor several resumes for one job, sending the system prompt and JD once per group of resumes.
+
+    Resumes missing from a combined response (truncated or malformed JSON) are retried one by one.
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY is required for resume tailoring")
+
+    models = [_tailor_model(r, job_description, model) for r in resumes]
+    keys = [_cache_key(m, r, job_description) for m, r in zip(models, resumes)]
+    results: list[dict[str, Any] | None] = await tailor_cache.aget_many(keys)
+    # Group only resumes routed to the same model, so each result is produced by the model its key names
+    pending: dict[str, list[int]] = {}
+    for i, resume in enumerate(results):
+        if resume is None:
+            pending.setdefault(models[i], []).append(i)
+    groups = [
+        (routed, indices[i : i + SAME_JD_GROUP_SIZE])
+        for routed, indices in pending.items()
+        for i in range(0, len(indices), SAME_JD_GROUP_SIZE)
+    ]
+    client = _get_async_client(api_key)
+
+    semaphore = asyncio.Semaphore(TAILOR_CONCURRENCY)
+
+    async def run(routed: str, group: list[int]) -> None:
+        async with semaphore:
+            tailored: dict[int, dict[str, Any]] = {}
+            if len(group) > 1:
+                tailored = await _tailor_group_same_jd(client, [resumes[i] for i in group], job_description, routed)
+            await tailor_cache.aput_many((keys[group[pos]], resume) for pos, resume in tailored.items())
+            for pos, i in enumerate(group):
+                if pos in tailored:
+                    results[i] = tailored[pos]
+                else:
+                    results[i] = await tailor_resume_structured_async(resumes[i], job_description, api_key, routed)
+
+    await asyncio.gather(*(run(routed, group) for routed, group in groups))
+    return [resume_to_text(resume) for resume in results]
+
+
+_BATCH_FAILED_STATUSES = frozenset({"failed", "expired", "cancelled"})
+
+
+def _batch_line_resume(line: dict[str, Any]) -> dict[str, Any] | None:
+    response = line.get("response") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        return None
+    choices = (response.get("body") or {}).get("choices") or []
+    if not choices or choices[0].get("finish_reason") == "length":
+        return None
+    content = choices[0].get("message", {}).get("content")
+    try:
+        return parse_tailored_resume(content) if content else None
+    except ValueError:
+        return None
+
+
+def tailor_resumes_batch(
+    jobs: Iterable[tuple[str, str]],
+    api_key: str | None = None,
+    poll_interval: float = 5.0,
+    max_poll_interval: float = 300.0,
+) -> list[str]:
+    """Tailor many (resume_text, job_description) pairs through the Batch API; results keep the input order.
+
+    For non-interactive bulk jobs only: batches are billed at half price and have their own rate limit,
+    but may take up to the 24h completion window. This call blocks until the batch finishes.
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY is required for resume tailoring")
+
+    jobs = list(jobs)
+    models = [_tailor_model(r, j) for r, j in jobs]
+    keys = [_cache_key(m, r, j) for m, (r, j) in zip(models, jobs)]
+    results: list[dict[str, Any] | None] = tailor_cache.get_many(keys)
+    lines = []
+    for i, (resume_text, job_description) in enumerate(jobs):
+        if results[i] is None:
+            request = {
+                "custom_id": f"job-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": models[i],
+                    "messages": _tailor_messages(resume_text, job_description),
+                    "prompt_cache_key": TAILOR_PROMPT_CACHE_KEY,
+                    "max_completion_tokens": TAILOR_MAX_COMPLETION_TOKENS,
+                    "response_format": TAILORED_RESUME_RESPONSE_FORMAT,
+                },
+            }
+            lines.append(orjson.dumps(request))
+    if not lines:
+        return [resume_to_text(resume) for resume in results]
+
+    client = _get_client(api_key)
+    batch_file = client.files.create(file=("tailor-batch.jsonl", b"\n".join(lines)), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    while batch.status != "completed":
+        if batch.status in _BATCH_FAILED_STATUSES:
+            raise ValueError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, max_poll_interval)
+        batch = client.batches.retrieve(batch.id)
+    if not batch.output_file_id:
+        raise ValueError(f"OpenAI batch {batch.id} completed without an output file")
+
+    fresh: list[tuple[str, dict[str, Any]]] = []
+    for raw_line in client.files.content(batch.output_file_id).content.splitlines():
+        if not raw_line.strip():
+            continue
+        line = orjson.loads(raw_line)
+        i = int(line["custom_id"].removeprefix("job-"))
+        body = (line.get("response") or {}).get("body") or {}
+        if body.get("usage"):
+            record_usage("tailor_batch", body.get("model", ""), body["usage"])
+        resume = _batch_line_resume(line)
+        if resume:
+            results[i] = resume
+            fresh.append((keys[i], resume))
+    tailor_cache.put_many(fresh)
+
+    missing = [i for i, resume in enumerate(results) if resume is None]
+    if missing:
+        raise ValueError(f"OpenAI batch {batch.id} returned no text for jobs {missing}")
+    return [resume_to_text(resume) for resume in results]
 
 
 ANSWER_QUESTION_SYSTEM = """You are an expert career coach helping a candidate prepare for interviews. You have context from:
 1. The candidate's resume (tailored for the role)
 2. The job description
 
-Your task is to answer the application question in a short, form-appropriate way. Be specific: use details from the resume and job description. Do not invent facts—only use information from the provided resume and JD. Keep the tone professional and confident. Output only the answer text, no preamble or labels. Do not use double hyphens (--); use a single em dash (—) or a comma if needed. Output only the answer text, no preamble or labels.
+Your task is to answer the application question in a short, form-appropriate way. Be specific: use details from the resume and job description. Do not invent facts—only use information from the provided resume and JD. Keep the tone professional and confident. Output only the answer text, no preamble or labels. Do not use double hyphens (--); use a single em dash (—) or a comma if needed.
 
 Style guidelines for natural output:
 - Use simple language: Write plainly with short sentences. Example: "I need help with this issue."
@@ -153,48 +655,79 @@ Style guidelines for natural output:
 - Focus on clarity: Make your message easy to understand. Example: "Please send the file by Monday." """
 
 
-def answer_question(
-    question: str,
-    resume_text: str,
-    job_description: str,
-    api_key: str | None = None,
-) -> str:
-    """Generate a interview-style answer using JD and resume context."""
-    api_key = api_key or os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY is required for answer generation")
+_ANSWER_SYSTEM_MESSAGE = {"role": "system", "content": ANSWER_QUESTION_SYSTEM}
 
-    client = OpenAI(api_key=api_key)
 
-    user_content = f"""Resume (tailored for this role):
+_build_answer_user = """Resume (tailored for this role):
 
 ---
-{resume_text}
+{resume}
 ---
 
 Job description:
 
 ---
-{job_description}
+{job}
 ---
 
 Application question (from the job application form): {question}
 
-Provide a short, specific answer suitable for the application form, using only the resume and JD above. Output only the answer."""
+Provide a short, specific answer suitable for the application form, using only the resume and JD above. Output only the answer.""".format
 
-    response = client.chat.completions.create(
-        model="gpt-5.2",
-        messages=[
-            {"role": "system", "content": ANSWER_QUESTION_SYSTEM},
-            {"role": "user", "content": user_content},
-        ],
-    )
+
+def _answer_messages(question: str, resume_text: str, job_description: str) -> list[dict[str, str]]:
+    user_content = _build_answer_user(resume=resume_text, job=job_description, question=question)
+
+    return [_ANSWER_SYSTEM_MESSAGE, {"role": "user", "content": user_content}]
+
+
+def _answer_text(response: Any) -> str:
     content = response.choices[0].message.content if response.choices else None
     if not content:
         raise ValueError("OpenAI returned no text for the answer")
     return _normalize_cover_letter(content.strip())
 
 
+def answer_question(
+    question: str,
+    resume_text: str,
+    job_description: str,
+    api_key: str | None = None,
+) -> str:
+    """Generate a interview-style answer using JD and resume context."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY is required for answer generation")
+
+    client = _get_client(api_key)
+
+    response = client.chat.completions.create(
+        model=DEFAULT_MODEL,
+        messages=_answer_messages(question, resume_text, job_description),
+    )
+    record_usage("answer", response.model, response.usage)
+    return _answer_text(response)
+
+
+async def answer_question_async(
+    question: str,
+    resume_text: str,
+    job_description: str,
+    api_key: str | None = None,
+) -> str:
+    """Async answer_question using the pooled client."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY is required for answer generation")
+
+    response = await _get_async_client(api_key).chat.completions.create(
+        model=DEFAULT_MODEL,
+        messages=_answer_messages(question, resume_text, job_description),
+    )
+    record_usage("answer", response.model, response.usage)
+    return _answer_text(response)
+
+
 COVER_LETTER_SYSTEM = """You are an expert career coach and cover letter writer. Your task is to write a short, natural-sounding cover letter that connects the candidate's resume to a specific job description. The letter must feel like it was written by a real person — confident, direct, and specific.
 
 ## CORE RULES
@@ -228,45 +761,75 @@ Only the cover letter text. No title. No heading. Start with the greeting. End w
 Sincerely,
 [Candidate Name from resume]"""
 
-def generate_cover_letter(
-    resume_text: str,
-    job_description: str,
-    api_key: str | None = None,
-) -> str:
-    """Generate a professional cover letter from resume and job description."""
-    api_key = api_key or os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY is required for cover letter generation")
+_COVER_LETTER_SYSTEM_MESSAGE = {"role": "system", "content": COVER_LETTER_SYSTEM}
 
-    client = OpenAI(api_key=api_key)
 
-    user_content = f"""Here is the candidate's resume (tailored for this role):
+_build_cover_letter_user = """Here is the candidate's resume (tailored for this role):
 
 ---
-{resume_text}
+{resume}
 ---
 
 Here is the job description:
 
 ---
-{job_description}
+{job}
 ---
 
-Write a natural-sounding cover letter: four paragraphs if the resume lists projects (opening, experience, projects, closing), otherwise three. Each paragraph 2–3 sentences (about 220–340 words total when projects are included). Include a paragraph on 1–2 resume projects and how they relate to the role when the resume has a PROJECTS section. The opening must be the candidate's voice (why they are interested), not a description or summary of the job. No double hyphens (--). Use only the information above. Output only the cover letter text, starting with the greeting and ending with the signature."""
+Write a natural-sounding cover letter: four paragraphs if the resume lists projects (opening, experience, projects, closing), otherwise three. Each paragraph 2–3 sentences (about 220–340 words total when projects are included). Include a paragraph on 1–2 resume projects and how they relate to the role when the resume has a PROJECTS section. The opening must be the candidate's voice (why they are interested), not a description or summary of the job. No double hyphens (--). Use only the information above. Output only the cover letter text, starting with the greeting and ending with the signature.""".format
 
-    response = client.chat.completions.create(
-        model="gpt-5.2",
-        messages=[
-            {"role": "system", "content": COVER_LETTER_SYSTEM},
-            {"role": "user", "content": user_content},
-        ],
-    )
+
+def _cover_letter_messages(resume_text: str, job_description: str) -> list[dict[str, str]]:
+    user_content = _build_cover_letter_user(resume=resume_text, job=job_description)
+
+    return [_COVER_LETTER_SYSTEM_MESSAGE, {"role": "user", "content": user_content}]
+
+
+def _cover_letter_text(response: Any) -> str:
     content = response.choices[0].message.content if response.choices else None
     if not content:
         raise ValueError("OpenAI returned no text for the cover letter")
     return _normalize_cover_letter(content.strip())
 
 
+def generate_cover_letter(
+    resume_text: str,
+    job_description: str,
+    api_key: str | None = None,
+) -> str:
+    """Generate a professional cover letter from resume and job description."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY is required for cover letter generation")
+
+    client = _get_client(api_key)
+
+    response = client.chat.completions.create(
+        model=DEFAULT_MODEL,
+        messages=_cover_letter_messages(resume_text, job_description),
+    )
+    record_usage("cover_letter", response.model, response.usage)
+    return _cover_letter_text(response)
+
+
+async def generate_cover_letter_async(
+    resume_text: str,
+    job_description: str,
+    api_key: str | None = None,
+) -> str:
+    """Async generate_cover_letter using the pooled client."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY is required for cover letter generation")
+
+    response = await _get_async_client(api_key).chat.completions.create(
+        model=DEFAULT_MODEL,
+        messages=_cover_letter_messages(resume_text, job_description),
+    )
+    record_usage("cover_letter", response.model, response.usage)
+    return _cover_letter_text(response)
+
+
 def _normalize_cover_letter(text: str) -> str:
     """Remove or fix double hyphens and other artifacts so the letter reads naturally."""
     # Replace double (or more) hyphens with a single em dash
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import socket
+import threading
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Prompt caching only applies to prompts of at least this many tokens, so shorter ones are left out of the ratio
+CACHEABLE_PROMPT_TOKENS = 1024
+# The cached share of tailoring prompt tokens is measured over windows of CACHE_RATIO_WINDOW calls. Its healthy
+# level depends on the traffic (the system prompt alone is under the caching floor, so first-time resumes report
+# nothing cached), so the warning fires on a drop below CACHE_RATIO_DROP x a rolling baseline of earlier windows
+# rather than at a fixed share.
+CACHE_RATIO_WINDOW = 50
+CACHE_RATIO_DROP = 0.5
+# Weight of the newest window in the exponentially weighted baseline
+_BASELINE_WEIGHT = 0.2
+
+_queue: queue.Queue[tuple[str, str, int, int, int]] = queue.Queue(maxsize=10_000)
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+
+
+def _field(obj: Any, name: str) -> Any:
+    # Usage arrives as an SDK model or, from raw/batch responses, as the decoded JSON dict
+    return obj.get(name) if isinstance(obj, Mapping) else getattr(obj, name, None)
+
+
+def record_usage(operation: str, model: str, usage: Any) -> None:
+    """Queue token counts from a completion's usage for the background reporter; never blocks the caller."""
+    if usage is None:
+        return
+    details = _field(usage, "prompt_tokens_details")
+    cached = (_field(details, "cached_tokens") or 0) if details is not None else 0
+    prompt = _field(usage, "prompt_tokens") or 0
+    completion = _field(usage, "completion_tokens") or 0
+    try:
+        _queue.put_nowait((operation, model, prompt, completion, cached))
+    except queue.Full:
+        return
+    _ensure_worker()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_drain, name="openai-usage", daemon=True)
+            _worker.start()
+
+
+def _statsd_target() -> tuple[str, int] | None:
+    host = os.getenv("STATSD_HOST")
+    return (host, int(os.getenv("STATSD_PORT", "8125"))) if host else None
+
+
+def _drain() -> None:
+    target = _statsd_target()
+    prefix = os.getenv("STATSD_PREFIX", "resume_worker")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) if target else None
+    window: deque[tuple[int, int]] = deque(maxlen=CACHE_RATIO_WINDOW)
+    baseline: float | None = None
+    while True:
+        operation, model, prompt, completion, cached = _queue.get()
+        logger.info(
+            "OpenAI usage op=%s model=%s prompt_tokens=%d completion_tokens=%d cached_tokens=%d",
+            operation,
+            model,
+            prompt,
+            completion,
+            cached,
+        )
+        if sock is not None:
+            metric = f"{prefix}.openai.{operation}"
+            payload = (
+                f"{metric}.prompt_tokens:{prompt}|c\n"
+                f"{metric}.completion_tokens:{completion}|c\n"
+                f"{metric}.cached_tokens:{cached}|c"
+            )
+            try:
+                sock.sendto(payload.encode(), target)
+            except OSError:
+                pass
+        if operation.startswith("tailor") and prompt >= CACHEABLE_PROMPT_TOKENS:
+            window.append((prompt, cached))
+            if len(window) == CACHE_RATIO_WINDOW:
+                ratio = sum(c for _, c in window) / sum(p for p, _ in window)
+                if baseline is not None and ratio < baseline * CACHE_RATIO_DROP:
+                    logger.warning(
+                        "Cached share of tailoring prompt tokens fell to %.0f%% over the last %d calls from a "
+                        "baseline of %.0f%%; the prompt prefix may have stopped being stable",
+                        ratio * 100,
+                        CACHE_RATIO_WINDOW,
+                        baseline * 100,
+                    )
+                baseline = ratio if baseline is None else baseline + _BASELINE_WEIGHT * (ratio - baseline)
+                window.clear()
@@ -0,0 +1,61 @@
+from app.resume.pdf_gen import _parse_blocks, _structured_resume_blocks
+from app.resume.structured import resume_to_text
+
+RESUME = {
+    "name": "Jane Doe",
+    "contact": ["jane@example.com", "Austin, TX"],
+    "summary": "Security engineer with 6 years of cloud security experience.",
+    "section_order": ["experience", "other_sections", "skills"],
+    "experience": [
+        {
+            "title": "Security Engineer",
+            "company": "Acme",
+            "location": "",
+            "dates": "Jan 2019 – Present",
+            "bullets": ["Built SIEM detections for 2M events/day"],
+        }
+    ],
+    "projects": [],
+    "skills": [{"category": "Cloud", "items": ["AWS", "GCP"]}],
+    "education": [],
+    "certifications": ["OSCP"],
+    "other_sections": [{"heading": "Awards", "bullets": ["CTF winner 2022"]}],
+}
+
+
+def test_other_sections_render_in_section_order() -> None:
+    text = resume_to_text(RESUME)
+
+    assert text.index("EXPERIENCE") < text.index("AWARDS\n\n- CTF winner 2022") < text.index("SKILLS")
+
+
+def test_bold_titles_parse_as_job_titles_and_match_structured_blocks() -> None:
+    blocks = _parse_blocks(resume_to_text(RESUME))
+
+    assert ("job_title", "**Security Engineer** | Acme | Jan 2019 – Present") in blocks
+    assert ("bullet", "OSCP") in blocks
+    assert blocks == _structured_resume_blocks(RESUME)
+
+
+def test_all_caps_entry_titles_are_not_section_headings() -> None:
+    resume = {
+        **RESUME,
+        "section_order": ["education"],
+        "education": [
+            {"degree": "MS CS", "school": "MIT", "location": "", "dates": "", "details": ["GPA 3.9"]},
+            {"degree": "", "school": "MIT", "location": "", "dates": "", "details": []},
+            {"degree": "", "school": "CMU", "location": "", "dates": "", "details": ["Exchange term"]},
+        ],
+    }
+    blocks = _parse_blocks(resume_to_text(resume))
+
+    assert ("job_title", "**MS CS** | MIT") in blocks
+    assert [content for kind, content in blocks if kind == "section"] == [
+        "SUMMARY",
+        "EDUCATION",
+        "EXPERIENCE",
+        "SKILLS",
+        "CERTIFICATIONS",
+        "AWARDS",
+    ]
+    assert blocks == _structured_resume_blocks(resume)
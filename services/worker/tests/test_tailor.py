@@ -0,0 +1,74 @@
+from app.resume.tailor import MAX_JD_CHARS, RESUME_TAILOR_SYSTEM, _truncate_job_description
+
+# Same ~4 chars/token estimate as the input budgets: ~1200 tokens for the fixed tailoring instructions
+MAX_SYSTEM_PROMPT_CHARS = 4800
+
+
+def test_tailor_system_prompt_stays_within_budget() -> None:
+    assert len(RESUME_TAILOR_SYSTEM) <= MAX_SYSTEM_PROMPT_CHARS
+
+
+def _jd(responsibility_lines: int) -> str:
+    about = "About us\nAcme builds payment infrastructure for banks."
+    responsibilities = "Responsibilities\n" + "\n".join(
+        f"- Run threat modeling review {i} for cloud services and report findings." for i in range(responsibility_lines)
+    )
+    benefits = "Benefits\nHealth insurance, 401k and unlimited PTO."
+    return f"{about}\n\n{responsibilities}\n\n{benefits}"
+
+
+def test_oversized_requirements_section_is_cut_not_dropped() -> None:
+    jd = _jd(130)
+    assert len(jd) > MAX_JD_CHARS
+
+    truncated = _truncate_job_description(jd)
+
+    assert len(truncated) <= MAX_JD_CHARS
+    assert truncated.startswith("Responsibilities\n- Run threat modeling review 0 ")
+    # Cut at a line boundary, and the boilerplate goes before any requirements text
+    assert truncated.endswith("report findings.")
+    assert "About us" not in truncated
+    assert "Benefits" not in truncated
+    assert len(truncated) > MAX_JD_CHARS - 100
+
+
+def test_fluff_is_dropped_and_kept_sections_stay_in_order() -> None:
+    jd = _jd(60) + "\n\nPerks\n" + "Free lunch, gym membership and team offsites every quarter. " * 80
+    assert len(jd) > MAX_JD_CHARS
+
+    truncated = _truncate_job_description(jd)
+
+    assert truncated == _jd(60)
+    assert "Perks" not in truncated
+
+
+def _bullets(count: int) -> str:
+    return "\n".join(f"- Lead incident response drill {i} across production cloud accounts." for i in range(count))
+
+
+def test_boilerplate_heading_above_requirements_does_not_take_them_down() -> None:
+    jd = (
+        "Senior Security Engineer\n\nWe are hiring a security engineer to protect our payment platform.\n\n"
+        f"Compensation\n\n$150,000 - $180,000\n\nResponsibilities\n\n{_bullets(130)}"
+    )
+    assert len(jd) > MAX_JD_CHARS
+
+    truncated = _truncate_job_description(jd)
+
+    assert len(truncated) > MAX_JD_CHARS - 100
+    assert "Responsibilities\n- Lead incident response drill 0 " in truncated
+    assert "Compensation" not in truncated
+
+
+def test_team_intro_heading_does_not_leave_only_benefits() -> None:
+    jd = (
+        f"About the team\n\nPlatform Security\n\nWhat you'll do\n\n{_bullets(130)}\n\n"
+        "Benefits\n\nHealth insurance, 401k and unlimited PTO."
+    )
+    assert len(jd) > MAX_JD_CHARS
+
+    truncated = _truncate_job_description(jd)
+
+    assert truncated.startswith("What you'll do\n- Lead incident response drill 0 ")
+    assert len(truncated) > MAX_JD_CHARS - 100
+    assert "Benefits" not in truncated
@@ -18,7 +18,8 @@ export async function POST(request: Request) {
   body.append("resume", resume);
   body.append("job_description", jobDescription.trim());
 
-  const res = await fetch(`${WORKER_BASE_URL}/resume/tailor`, {
+  // inline=0: skip the base64 PDF in the JSON; the page renders it via /api/resume/to-pdf (raw bytes)
+  const res = await fetch(`${WORKER_BASE_URL}/resume/tailor?inline=0`, {
     method: "POST",
     body,
   });
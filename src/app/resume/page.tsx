@@ -140,6 +140,13 @@ export default function ResumeTailorPage() {
     setTailoredResumeText(data.tailored_resume);
     if (data.pdf_base64) {
       setPdfBlobUrl(base64ToBlobUrl(data.pdf_base64, "application/pdf"));
+    } else {
+      try {
+        const blob = await fetchPdfFromContent(data.tailored_resume, null);
+        setPdfBlobUrl(URL.createObjectURL(blob));
+      } catch (e) {
+        setError(e instanceof Error ? e.message : "Failed to generate PDF");
+      }
     }
     const nextCount = getStoredCount() + 1;
     setStoredCount(nextCount);
@@ -14,8 +14,8 @@ export function resumeTextToHtml(plain: string): string {
       i++;
       continue;
     }
-    // Section header: short, all caps
-    if (trimmed.length < 50 && trimmed === trimmed.toUpperCase() && trimmed.length > 2) {
+    // Section header: short, all caps, no field separators (entry titles like "**MS CS** | MIT")
+    if (trimmed.length < 50 && trimmed === trimmed.toUpperCase() && trimmed.length > 2 && !trimmed.includes("|")) {
       const title = trimmed.charAt(0) + trimmed.slice(1).toLowerCase();
       out.push(`<h2>${escapeHtml(title)}</h2>`);
       i++;
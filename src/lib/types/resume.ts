@@ -1,6 +1,7 @@
 export type TailorResumeResponse = {
   tailored_resume: string;
-  pdf_base64: string;
+  /** Only present when the worker is called with inline=1 (its default). */
+  pdf_base64?: string;
 };
 
 export type AnswerQuestionRequest = {